@@ -0,0 +1,443 @@
+"""
+Evaluasi S-box secara batch tanpa Streamlit.
+
+Contoh:
+    python batch.py candidates.jsonl -o results.csv --metrics nl,du,lap --workers 8
+    python batch.py candidates.jsonl -o results.csv --resume
+    python batch.py --affine circulant -o circulant.csv --metrics nl,du,lap
+    python batch.py candidates.jsonl -o passed.csv --screen "nl>=112,du<=4,ad==7,sac=0.5~0.01"
+    python batch.py --affine random --count 100000 -o random.csv --dedupe classes.sqlite
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from utils.analysis import configure_cache, CACHE_DIR_ENV
+from utils import instrumentation
+from utils.affine_generator import affine_family, iter_affine_family, AES_CONSTANT
+from utils.sbox import SBox
+from utils.equivalence import EquivalenceIndex, equivalence_invariants, invariant_key
+from utils.export import write_batch_report
+from utils.screening import screen_sbox, parse_thresholds
+# Nama kolom -> metrik (callable, modulnya di-import saat pertama dipakai)
+from utils.registry import METRICS, schedule
+
+# Jumlah analysis yang disimpan di memori oleh setiap worker
+WORKER_CACHE_ENTRIES = 4
+
+
+# READERS
+
+def _read_csv(path, per_file):
+    with open(path, newline="") as f:
+        rows = (row for row in csv.reader(f) if any(cell.strip() for cell in row))
+        if per_file:
+            yield os.path.basename(path), [int(v) for row in rows for v in row if v.strip()]
+            return
+        for i, row in enumerate(rows):
+            yield str(i), [int(v) for v in row if v.strip()]
+
+
+def _sheet_rows(path, rows, per_file):
+    rows = (row for row in rows if row)
+    if per_file:
+        yield os.path.basename(path), [v for row in rows for v in row]
+        return
+    for i, row in enumerate(rows):
+        yield str(i), row
+
+
+def _read_xlsx(path, per_file):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from _sheet_rows(path, (
+            [int(v) for v in row if v is not None]
+            for row in workbook.active.iter_rows(values_only=True)
+        ), per_file)
+    finally:
+        workbook.close()
+
+
+def _read_xls(path, per_file):
+    # openpyxl tidak bisa membuka format BIFF lama; pandas memakai xlrd,
+    # sama seperti upload di main.py
+    import pandas as pd
+
+    frame = pd.read_excel(path, header=None)
+    yield from _sheet_rows(path, (
+        [int(v) for v in row if not pd.isna(v)]
+        for row in frame.itertuples(index=False)
+    ), per_file)
+
+
+def _read_npy(path, per_file):
+    array = np.load(path, mmap_mode="r")
+    if array.ndim == 1 or per_file:
+        yield os.path.basename(path), np.asarray(array).ravel().tolist()
+        return
+    for i in range(array.shape[0]):
+        yield str(i), np.asarray(array[i]).ravel().tolist()
+
+
+def _read_jsonl(path, per_file):
+    with open(path) as f:
+        for i, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                yield str(record.get("id", i)), record["sbox"]
+            else:
+                yield str(i), record
+
+
+READERS = {
+    ".csv": _read_csv,
+    ".xls": _read_xls,
+    ".xlsx": _read_xlsx,
+    ".npy": _read_npy,
+    ".jsonl": _read_jsonl,
+}
+
+
+def iter_sboxes(path, per_file=False):
+    """
+    Yield (id, values) for every S-box in `path`, one S-box per row/line.
+    With per_file=True the whole file is read as a single S-box, like the
+    upload in main.py.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Format input tidak didukung: {ext}")
+    return READERS[ext](path, per_file)
+
+
+# WRITERS
+
+class _CsvWriter:
+    def __init__(self, f, metrics, write_header):
+        self.f = f
+        self.writer = csv.DictWriter(f, fieldnames=["index", "id", *metrics, "error"])
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+
+class _JsonlWriter:
+    def __init__(self, f, metrics, write_header):
+        self.f = f
+
+    def write(self, row):
+        self.f.write(json.dumps(row) + "\n")
+
+
+WRITERS = {".csv": _CsvWriter, ".jsonl": _JsonlWriter}
+
+
+# CHECKPOINT
+
+def _checkpoint_path(output):
+    return output + ".ckpt"
+
+
+def _load_checkpoint(output):
+    try:
+        with open(_checkpoint_path(output)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _save_checkpoint(output, state):
+    tmp_path = _checkpoint_path(output) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, _checkpoint_path(output))
+
+
+# EVALUATION
+
+# Index ekuivalensi read-only milik worker (--dedupe)
+_worker = {"index": None}
+
+
+def _init_worker(cache_dir, instrument=None, index_path=None):
+    configure_cache(cache_dir=cache_dir, max_entries=WORKER_CACHE_ENTRIES)
+    if instrument is not None:
+        instrumentation.configure_instrumentation(*instrument)
+    if index_path is not None:
+        _worker["index"] = EquivalenceIndex(index_path, readonly=True)
+
+
+def evaluate_sbox(values, metrics):
+    """
+    Evaluate the chosen metrics of one S-box. A failing metric is left
+    empty and reported in the "error" column, the other metrics keep
+    their values.
+    """
+    row = {}
+    try:
+        # Tabel bersama setiap metrik dibangun sekali (utils.registry)
+        futures = schedule(SBox(values), metrics)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row
+    errors = []
+    for name, future in futures.items():
+        try:
+            value = future.result()
+        except Exception as e:
+            errors.append(f"{name}: {type(e).__name__}: {e}")
+            continue
+        row[name] = float(value) if isinstance(value, (float, np.floating)) else int(value)
+    row["error"] = "; ".join(errors)
+    return row
+
+
+def _passes_screen(values, thresholds):
+    try:
+        return screen_sbox(SBox(values), thresholds)["passed"]
+    except Exception:
+        # Input tidak valid: biarkan evaluate_sbox melaporkan error-nya
+        return True
+
+
+def _invariants(values):
+    try:
+        invariants = equivalence_invariants(SBox(values))
+    except Exception:
+        # Input tidak valid: biarkan evaluate_sbox melaporkan error-nya
+        return None, None
+    return invariant_key(invariants=invariants), invariants
+
+
+def evaluate_chunk(chunk, metrics, thresholds=None, equivalence_index=None):
+    """
+    Evaluate a chunk, dropping the S-boxes that fail the screening thresholds.
+    With an EquivalenceIndex, S-boxes whose invariant key is already stored
+    are dropped as well, and every row carries its "key" and "invariants".
+    """
+    rows = []
+    for index, sbox_id, values in chunk:
+        if thresholds and not _passes_screen(values, thresholds):
+            continue
+        row = {"index": index, "id": sbox_id}
+        if equivalence_index is not None:
+            row["key"], row["invariants"] = _invariants(values)
+            if row["key"] is not None and equivalence_index.contains_key(row["key"]):
+                continue
+        row.update(evaluate_sbox(values, metrics))
+        rows.append(row)
+    return rows
+
+
+def _evaluate_task(chunk, metrics, thresholds):
+    # Statistik instrumentasi worker ikut dikirim ke proses utama
+    rows = evaluate_chunk(chunk, metrics, thresholds, _worker["index"])
+    return rows, instrumentation.drain() if instrumentation.is_enabled() else None
+
+
+def _chunks(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(input_path, output_path, metrics, workers=None, chunk_size=64,
+              resume=False, per_file=False, checkpoint_every=1, thresholds=None,
+              dedupe=None):
+    """
+    Evaluate every S-box of `input_path` and stream the rows to `output_path`.
+    `input_path` may also be an iterable of (id, values) pairs, e.g. from
+    iter_affine_family, which must yield the same sequence on --resume.
+
+    At most 2 * workers chunks are in flight, rows are written in input order
+    and a checkpoint (input S-boxes done + output byte offset) is stored after every
+    `checkpoint_every` chunks, so a killed run continues where it stopped.
+    With `thresholds` (see utils.screening) only S-boxes passing the
+    screening are evaluated and written. With `dedupe`, the path of an
+    utils.equivalence index, S-boxes equivalent to one already in the
+    index (from earlier runs or earlier in this run) are skipped, and new
+    ones are stored there with their scores. When utils.instrumentation is
+    enabled, the workers record their metric calls too and the stats are
+    merged into this process.
+
+    Returns:
+        int: number of rows written in this run
+    """
+    unknown = [m for m in metrics if m not in METRICS]
+    if unknown:
+        raise ValueError(f"Metrik tidak dikenal: {', '.join(unknown)}")
+
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Format output tidak didukung: {ext}")
+
+    done = 0
+    state = _load_checkpoint(output_path) if resume else None
+    if resume and state is None:
+        # Tanpa checkpoint, --resume tidak boleh menimpa output yang ada
+        raise ValueError(f"Checkpoint tidak ditemukan: {_checkpoint_path(output_path)}")
+    if state is not None:
+        if state["metrics"] != list(metrics):
+            raise ValueError("Checkpoint dibuat dengan daftar metrik yang berbeda")
+        done = state["done"]
+        # Buang baris yang tertulis setelah checkpoint terakhir
+        with open(output_path, "r+b") as f:
+            f.truncate(state["offset"])
+
+    workers = workers or os.cpu_count() or 1
+    instrument = None
+    if instrumentation.is_enabled():
+        instrument = (True, instrumentation.profiling_enabled())
+    if isinstance(input_path, (str, os.PathLike)):
+        sboxes = iter_sboxes(input_path, per_file)
+    else:
+        sboxes = input_path
+    items = (
+        (index, sbox_id, values)
+        for index, (sbox_id, values) in enumerate(sboxes)
+        if index >= done
+    )
+
+    # Dibuat sebelum worker dimulai agar worker bisa membukanya read-only
+    index = EquivalenceIndex(dedupe) if dedupe else None
+
+    written = 0
+    consumed = 0
+    with open(output_path, "a" if state is not None else "w", newline="") as f, \
+            ProcessPoolExecutor(workers, initializer=_init_worker,
+                                initargs=(os.environ.get(CACHE_DIR_ENV) or None,
+                                          instrument, dedupe)) as pool:
+        writer = WRITERS[ext](f, metrics, write_header=state is None)
+        pending = deque()
+        chunks = _chunks(items, chunk_size)
+        finished_chunks = 0
+
+        def submit_next():
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append((pool.submit(_evaluate_task, chunk, metrics, thresholds), chunk))
+
+        for _ in range(2 * workers):
+            submit_next()
+
+        while pending:
+            future, chunk = pending.popleft()
+            rows, stats = future.result()
+            if stats is not None:
+                instrumentation.merge(*stats)
+            submit_next()
+            if index is not None:
+                rows = _store_equivalence_classes(index, rows, chunk, metrics)
+            for row in rows:
+                writer.write(row)
+            written += len(rows)
+            consumed += len(chunk)
+            finished_chunks += 1
+
+            if finished_chunks % checkpoint_every == 0 or not pending:
+                f.flush()
+                if index is not None:
+                    index.commit()
+                _save_checkpoint(output_path, {
+                    "done": done + consumed,
+                    "offset": f.tell(),
+                    "metrics": list(metrics),
+                })
+
+    if index is not None:
+        index.close()
+    return written
+
+
+def _store_equivalence_classes(index, rows, chunk, metrics):
+    # Worker hanya melihat index yang sudah di-commit: S-box ekuivalen dalam
+    # run yang sama disaring di sini, sebelum ditulis
+    values = {i: v for i, _, v in chunk}
+    kept = []
+    for row in rows:
+        key, invariants = row.pop("key"), row.pop("invariants")
+        if key is not None and not row["error"]:
+            if index.contains_key(key):
+                continue
+            scores = {name: row[name] for name in metrics}
+            index.add(values[row["index"]], row["id"], scores, key=key, invariants=invariants)
+        kept.append(row)
+    return kept
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluasi batch S-box")
+    parser.add_argument("input", nargs="?", help="File S-box (.csv, .xlsx, .npy, .jsonl)")
+    parser.add_argument("-o", "--output", required=True, help="File hasil (.csv atau .jsonl)")
+    parser.add_argument("-m", "--metrics", default=",".join(METRICS),
+                        help=f"Daftar metrik dipisah koma ({', '.join(METRICS)})")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Jumlah proses worker")
+    parser.add_argument("--chunk-size", type=int, default=64, help="S-box per tugas worker")
+    parser.add_argument("--resume", action="store_true", help="Lanjutkan dari checkpoint")
+    parser.add_argument("--per-file", action="store_true",
+                        help="Baca seluruh file sebagai satu S-box")
+    parser.add_argument("--affine", choices=["circulant", "random"],
+                        help="Bangkitkan S-box affine dari inversi GF(2^8) sebagai input")
+    parser.add_argument("--count", type=int, default=None,
+                        help="Jumlah matriks untuk --affine random")
+    parser.add_argument("--seed", type=int, default=0, help="Seed untuk --affine random")
+    parser.add_argument("--constant", type=lambda v: int(v, 0), default=AES_CONSTANT,
+                        help="Konstanta affine (default 0x63)")
+    parser.add_argument("--screen", default=None,
+                        help='Ambang screening, mis. "nl>=112,du<=4,ad==7,sac=0.5~0.01"')
+    parser.add_argument("--dedupe", default=None,
+                        help="Index ekuivalensi (SQLite): lewati S-box yang ekuivalen dengan "
+                             "S-box yang sudah tersimpan, simpan yang baru")
+    parser.add_argument("--report", default=None,
+                        help="Tulis laporan XLSX (hasil dan ringkasan per metrik) ke file ini")
+    parser.add_argument("--instrument", default=None,
+                        help="Tulis statistik waktu/memori per metrik ke file JSON ini")
+    parser.add_argument("--profile", default=None,
+                        help="Tulis dump cProfile gabungan semua worker ke file ini")
+    args = parser.parse_args(argv)
+
+    if args.instrument or args.profile:
+        instrumentation.configure_instrumentation(enabled=True, profile=bool(args.profile) or None)
+
+    if args.affine:
+        source = iter_affine_family(affine_family(args.affine, args.count, args.seed),
+                                    args.constant)
+    elif args.input:
+        source = args.input
+    else:
+        parser.error("input atau --affine harus diberikan")
+
+    metrics = [m.strip() for m in args.metrics.split(",") if m.strip()]
+    written = run_batch(source, args.output, metrics, workers=args.workers,
+                        chunk_size=args.chunk_size, resume=args.resume,
+                        per_file=args.per_file,
+                        thresholds=parse_thresholds(args.screen) if args.screen else None,
+                        dedupe=args.dedupe)
+    print(f"{written} S-box dievaluasi -> {args.output}", file=sys.stderr)
+    if args.report:
+        write_batch_report(args.output, args.report)
+    if args.instrument:
+        instrumentation.export_json(args.instrument)
+    if args.profile:
+        instrumentation.export_profile(args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""
+Benchmark dan uji regresi untuk semua metrik S-box dan jalur AES.
+
+Setiap metrik dijalankan pada S-box AES, S-box44, S-box PRESENT dan
+permutasi acak berbagai ukuran. Waktu (cold cache) dan puncak memori
+(tracemalloc) dicatat, hasilnya dicek terhadap nilai referensi
+independen (nilai terpublikasi, implementasi awal repo, oracle naif)
+atau, jika tidak ada, terhadap snapshot regresi, lalu laporan ditulis
+sebagai JSON. Exit code 1 jika ada hasil yang salah.
+
+Contoh:
+    python benchmark.py -o benchmark.json
+    python benchmark.py -o new.json --compare benchmark.json
+    python benchmark.py --sizes 4,6,8,10,12 --repeat 5 --metrics nl,du,lap
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from batch import METRICS
+from utils.analysis import configure_cache
+from utils.aes_core import AESEngine, RIJNDAEL_SBOX
+from utils.aes_stream import ctr_stream, ctr_image
+from utils.aes_text import encrypt_text, decrypt_text
+from utils.affine_generator import affine_sboxes, K44_MATRIX
+from utils.cipher_container import write_cipher_image, read_cipher_image
+from utils.image_metrics import image_metrics
+
+PRESENT_SBOX = [12, 5, 6, 11, 9, 0, 10, 13, 3, 14, 15, 8, 4, 7, 1, 2]
+SBOX44 = affine_sboxes(K44_MATRIX)[0].tolist()
+
+# Nilai referensi yang tidak berasal dari kode yang diuji:
+# - NL, SAC, BIC, LAP, DAP, DU, AD dan CI untuk AES dan S-box44 dari
+#   implementasi awal repo (loop langsung sebelum vektorisasi)
+# - AES: TO 7.860 (Prouff 2005), MTO 6.916 (Chakraborty dkk. 2017),
+#   BU 6 (Boura dan Canteaut 2018), DLU 16 = indikator absolut inversi
+#   GF(2^8) / 2 (Bar-On dkk. 2019)
+# - S-box44 affine-equivalent dengan inversi, jadi BU, DLU dan AD minimum
+#   sama dengan AES
+# - PRESENT: NL, LAP (linearity 8), DU, DAP dan AD dari Bogdanov dkk. 2007
+REFERENCE = {
+    "aes": {
+        "nl": 112, "sac": 0.5048828125, "bic_nl": 112, "bic_sac": 0.5046037946428571,
+        "lap": 0.0625, "dap": 0.015625, "du": 4, "ad": 7, "ad_min": 7, "ci": 0,
+        "to": 7.860049019607843, "bu": 6, "dlu": 16, "mto": 6.916053921568627,
+    },
+    "sbox44": {
+        "nl": 112, "sac": 0.500732421875, "bic_nl": 112, "bic_sac": 0.5023716517857143,
+        "lap": 0.0625, "dap": 0.015625, "du": 4, "ad": 7, "ad_min": 7, "ci": 0,
+        "bu": 6, "dlu": 16,
+    },
+    "present": {
+        "nl": 4, "lap": 0.25, "du": 4, "dap": 0.25, "ad": 3,
+    },
+}
+
+# Snapshot regresi: nilai yang dicatat dari versi sebelumnya kode ini sendiri,
+# bukan acuan independen. Hanya mendeteksi perubahan hasil.
+SNAPSHOT = {
+    "aes": {
+        "cc_mean": 4.015686274509804, "cc_var": 0.11130418589004229,
+    },
+    "sbox44": {
+        "to": 7.853186274509804, "mto": 6.923406862745098,
+        "cc_mean": 4.015686274509804, "cc_var": 0.11341815647827759,
+    },
+    "present": {
+        "sac": 0.625, "bic_nl": 4, "bic_sac": 0.5625, "ad_min": 2, "ci": 0,
+        "to": 3.533333333333333, "bu": 16, "dlu": 8,
+    },
+}
+
+TOLERANCE = 1e-9
+
+# FIPS-197 Appendix C.1
+FIPS_KEY = bytes(range(16))
+FIPS_PLAINTEXT = bytes.fromhex("00112233445566778899aabbccddeeff")
+FIPS_CIPHERTEXT = bytes.fromhex("69c4e0d86a7b0430d8cdb78070b4c55a")
+
+
+# ORACLE NAIF
+# Definisi langsung (loop Python) untuk permutasi kecil, sebagai acuan
+# independen bagi implementasi vektor
+
+def _dot(a, b):
+    return bin(a & b).count("1") & 1
+
+
+def _naive(values):
+    size = len(values)
+    n = size.bit_length() - 1
+    m = n
+    masks = range(1, size)
+
+    def walsh(b, a):
+        return sum(1 if _dot(b, values[x]) == _dot(a, x) else -1 for x in range(size))
+
+    coordinate_bias = max(abs(walsh(1 << j, a)) for j in range(m) for a in masks)
+    max_bias = max(abs(walsh(b, a)) for b in masks for a in masks)
+    ddt_max = max(
+        max(sum(1 for x in range(size) if values[x] ^ values[x ^ a] == d) for d in range(size))
+        for a in masks
+    )
+    flips = sum(
+        bin(values[x] ^ values[x ^ (1 << i)]).count("1") for x in range(size) for i in range(n)
+    )
+
+    degree = 0
+    for j in range(m):
+        anf = [(values[x] >> j) & 1 for x in range(size)]
+        for i in range(n):
+            for x in range(size):
+                if x >> i & 1:
+                    anf[x] ^= anf[x ^ (1 << i)]
+        degree = max([degree] + [bin(u).count("1") for u in range(size) if anf[u]])
+
+    return {
+        "nl": size // 2 - coordinate_bias // 2,
+        "lap": max_bias / size / 2,
+        "du": ddt_max,
+        "dap": ddt_max / size,
+        "sac": flips / (size * n * m),
+        "ad": degree,
+    }
+
+
+# PENGUKURAN
+
+def _measure(func, repeat):
+    """
+    Time `func` `repeat` times with a cold analysis cache, then run it once
+    more under tracemalloc for the peak memory.
+
+    Returns:
+        tuple: (last result, list of seconds, peak bytes)
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        configure_cache()
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+
+    configure_cache()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, times, peak
+
+
+def _as_number(value):
+    return float(value) if isinstance(value, (float, np.floating)) else int(value)
+
+
+def _record(case, target, times, peak, value=None, expected=None, ok=True, **extra):
+    return {
+        "case": case,
+        "target": target,
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "repeat": len(times),
+        "peak_bytes": peak,
+        "value": value,
+        "expected": expected,
+        "ok": ok,
+        **extra,
+    }
+
+
+def benchmark_metrics(sboxes, metrics, repeat, references, snapshots=None):
+    """
+    Time every metric on every S-box and check it against `references`
+    (independent values), or else against `snapshots` (earlier results of
+    this code). Every record names the kind of check in "check".
+    """
+    snapshots = snapshots or {}
+    records = []
+    for target, values in sboxes.items():
+        for name in metrics:
+            try:
+                value, times, peak = _measure(lambda: METRICS[name](values), repeat)
+            except Exception as e:
+                records.append(_record(name, target, [0.0], 0, ok=False,
+                                       error=f"{type(e).__name__}: {e}"))
+                continue
+            value = _as_number(value)
+            expected, check = None, None
+            for kind, table in (("reference", references), ("snapshot", snapshots)):
+                if name in table.get(target, {}):
+                    expected, check = table[target][name], kind
+                    break
+            ok = expected is None or abs(value - expected) <= TOLERANCE
+            records.append(_record(name, target, times, peak, value, expected, ok,
+                                   check=check))
+    return records
+
+
+def _throughput(record, nbytes):
+    record["bytes"] = nbytes
+    record["mb_per_s"] = nbytes / record["seconds_min"] / 1e6 if record["seconds_min"] else None
+    return record
+
+
+def benchmark_aes(repeat, size):
+    """Time the AES paths on `size` bytes and check them for correctness."""
+    records = []
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 256, size - size % 16, dtype=np.uint8)
+    key = bytes(rng.integers(0, 256, 16, dtype=np.uint8))
+
+    engine = AESEngine(FIPS_KEY)
+    fips_ok = engine.encrypt_ecb(FIPS_PLAINTEXT) == FIPS_CIPHERTEXT
+    fips_ok = fips_ok and engine.decrypt_ecb(FIPS_CIPHERTEXT) == FIPS_PLAINTEXT
+
+    engine = AESEngine(key, SBOX44)
+    blocks = data.reshape(-1, 16)
+    cipher, times, peak = _measure(lambda: engine.encrypt_blocks(blocks), repeat)
+    records.append(_throughput(_record("aes_encrypt_blocks", "sbox44", times, peak,
+                                       ok=fips_ok, fips_197=fips_ok), data.nbytes))
+    plain, times, peak = _measure(lambda: engine.decrypt_blocks(cipher), repeat)
+    records.append(_throughput(_record("aes_decrypt_blocks", "sbox44", times, peak,
+                                       ok=bool(np.array_equal(plain, blocks))), data.nbytes))
+
+    text = "S-box44 " * (size // 64)
+    text_key = "0123456789abcdef"
+    round_trip = lambda: decrypt_text(encrypt_text(text, text_key, SBOX44), text_key, SBOX44)
+    result, times, peak = _measure(round_trip, repeat)
+    records.append(_throughput(_record("aes_text_round_trip", "sbox44", times, peak,
+                                       ok=result == text), len(text)))
+
+    nonce = b"benchmrk"
+
+    def ctr_round_trip():
+        encrypted = io.BytesIO()
+        ctr_stream(io.BytesIO(data.tobytes()), encrypted, key, SBOX44, nonce)
+        decrypted = io.BytesIO()
+        ctr_stream(io.BytesIO(encrypted.getvalue()), decrypted, key, SBOX44, nonce)
+        return decrypted.getvalue()
+
+    result, times, peak = _measure(ctr_round_trip, repeat)
+    ctr_ok = result == data.tobytes()
+    try:
+        from Crypto.Cipher import AES
+    except ImportError:
+        pass
+    else:
+        # Dengan S-box Rijndael, CTR harus sama dengan PyCryptodome
+        reference = AES.new(key, AES.MODE_CTR, nonce=nonce).encrypt(data[:4096].tobytes())
+        encrypted = io.BytesIO()
+        ctr_stream(io.BytesIO(data[:4096].tobytes()), encrypted, key, RIJNDAEL_SBOX, nonce)
+        ctr_ok = ctr_ok and encrypted.getvalue() == reference
+    records.append(_throughput(_record("aes_ctr_stream_round_trip", "sbox44", times, peak,
+                                       ok=ctr_ok), 2 * data.nbytes))
+
+    side = int((size // 3) ** 0.5)
+    image = rng.integers(0, 256, (side, side, 3), dtype=np.uint8)
+
+    def container_round_trip():
+        buffer = io.BytesIO()
+        write_cipher_image(buffer, image, key, SBOX44, mode="ECB")
+        return read_cipher_image(buffer.getvalue(), key, SBOX44)[0]
+
+    result, times, peak = _measure(container_round_trip, repeat)
+    records.append(_throughput(_record("cipher_container_round_trip", "sbox44", times, peak,
+                                       ok=bool(np.array_equal(result, image))), 2 * image.nbytes))
+
+    cipher_image = ctr_image(image, key, SBOX44, nonce)
+    other = ctr_image(image, key[::-1], SBOX44, nonce)
+    result, times, peak = _measure(lambda: image_metrics(cipher_image, other), repeat)
+    # Acuan: definisi langsung NPCR dan UACI
+    difference = np.abs(cipher_image.astype(int) - other.astype(int))
+    expected = {"npcr": float(np.mean(difference != 0) * 100),
+                "uaci": float(np.mean(difference) / 255 * 100)}
+    value = {"npcr": result["npcr"], "uaci": result["uaci"]}
+    ok = all(abs(value[k] - expected[k]) <= TOLERANCE for k in expected)
+    records.append(_throughput(_record("image_metrics", "sbox44", times, peak, value=value,
+                                       expected=expected, ok=ok, check="oracle"),
+                               cipher_image.nbytes))
+    return records
+
+
+def compare(records, baseline_path):
+    """Add speedup = baseline seconds / new seconds to every matching record."""
+    with open(baseline_path) as f:
+        baseline = {
+            (r["case"], r["target"]): r for r in json.load(f)["results"]
+        }
+    for record in records:
+        base = baseline.get((record["case"], record["target"]))
+        if base and record["seconds_min"]:
+            record["baseline_seconds_min"] = base["seconds_min"]
+            record["speedup"] = base["seconds_min"] / record["seconds_min"]
+
+
+def run(sizes=(4, 6, 8, 10), metrics=None, repeat=3, aes_bytes=1 << 20, seed=0,
+        naive_max_bits=6, include_aes=True):
+    """
+    Run the whole suite.
+
+    Returns:
+        dict: environment, results (one record per case and target) and
+              the number of failures
+    """
+    metrics = list(metrics or METRICS)
+    sboxes = {"aes": RIJNDAEL_SBOX, "sbox44": SBOX44, "present": PRESENT_SBOX}
+    references = {name: REFERENCE[name] for name in sboxes}
+    snapshots = {name: SNAPSHOT[name] for name in sboxes}
+
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        target = f"random{n}"
+        values = rng.permutation(1 << n).tolist()
+        sboxes[target] = values
+        # Referensi permutasi acak kecil dari oracle naif
+        references[target] = _naive(values) if n <= naive_max_bits else {}
+
+    results = benchmark_metrics(sboxes, metrics, repeat, references, snapshots)
+    if include_aes:
+        results += benchmark_aes(repeat, aes_bytes)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+        },
+        "results": results,
+        "failures": sum(not r["ok"] for r in results),
+    }
+
+
+def _print_summary(report, stream=sys.stderr):
+    for r in report["results"]:
+        status = "OK  " if r["ok"] else "FAIL"
+        line = f"{status} {r['case']:<28} {r['target']:<10} {r['seconds_min'] * 1000:10.2f} ms" \
+               f" {r['peak_bytes'] / 1e6:9.2f} MB"
+        if r.get("speedup"):
+            line += f"  x{r['speedup']:.2f}"
+        if not r["ok"]:
+            line += f"  value={r['value']} expected={r['expected']} ({r.get('check')})" \
+                    f" {r.get('error', '')}"
+        print(line, file=stream)
+    print(f"{report['failures']} kegagalan", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dan uji regresi metrik S-box")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="File laporan JSON")
+    parser.add_argument("--sizes", default="4,6,8,10",
+                        help="Ukuran input (bit) permutasi acak, dipisah koma")
+    parser.add_argument("-m", "--metrics", default=",".join(METRICS),
+                        help=f"Daftar metrik dipisah koma ({', '.join(METRICS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan per kasus")
+    parser.add_argument("--aes-bytes", type=int, default=1 << 20,
+                        help="Ukuran data untuk benchmark AES")
+    parser.add_argument("--no-aes", action="store_true", help="Lewati benchmark AES")
+    parser.add_argument("--seed", type=int, default=0, help="Seed permutasi acak")
+    parser.add_argument("--compare", default=None,
+                        help="Laporan sebelumnya, untuk menghitung speedup")
+    args = parser.parse_args(argv)
+
+    metrics = [m.strip() for m in args.metrics.split(",") if m.strip()]
+    unknown = [m for m in metrics if m not in METRICS]
+    if unknown:
+        parser.error(f"Metrik tidak dikenal: {', '.join(unknown)}")
+
+    report = run(
+        sizes=[int(s) for s in args.sizes.split(",") if s.strip()],
+        metrics=metrics,
+        repeat=args.repeat,
+        aes_bytes=args.aes_bytes,
+        seed=args.seed,
+        include_aes=not args.no_aes,
+    )
+    if args.compare:
+        compare(report["results"], args.compare)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+    _print_summary(report)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,213 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.aes_text import encrypt_text, decrypt_text
-from utils.aes_image import encrypt_image
-from utils.npcr_uaci import calculate_npcr, calculate_uaci
+from utils.aes_image import encrypt_image, decrypt_image
+from utils.cipher_container import encrypt_image_container, read_cipher_image
+from utils.image_metrics import image_metrics, byte_entropy
+from utils import instrumentation
+from utils.registry import METRICS as REGISTRY, schedule
+from utils.export import write_sbox, write_tables
+from utils.sbox import SBox
 
-from utils.linear_approximation import linear_approximation_probability
-from utils.nonlinearity import compute_nonlinearity
-from utils.differential_uniformity import compute_differential_uniformity
-from utils.avalanche_criterion import strict_avalanche_criterion
-from utils.differential_approximation import calculate_dap
-from utils.entropy import compute_entropy
-from utils.bit_independence import calculate_bic_sac, calculate_bic_nl
-from utils.algebraic_degree import compute_algebraic_degree
-from utils.correlation_immunity import compute_correlation_immunity
-from utils.transparency_order import compute_transparency_order
+# Pemanggilan enkripsi dicatat oleh utils.instrumentation jika aktif
+# (SBOX_INSTRUMENT=1 atau SBOX_INSTRUMENT=profile)
+encrypt_text = instrumentation.instrument(encrypt_text)
+decrypt_text = instrumentation.instrument(decrypt_text)
+encrypt_image = instrumentation.instrument(encrypt_image)
+decrypt_image = instrumentation.instrument(decrypt_image)
+encrypt_image_container = instrumentation.instrument(encrypt_image_container)
+read_cipher_image = instrumentation.instrument(read_cipher_image)
+image_metrics = instrumentation.instrument(image_metrics)
+
+# Metrik evaluasi S-box yang ditampilkan (label dan format dari utils.registry)
+METRICS = ["nl", "sac", "bic_nl", "bic_sac", "lap", "dap", "ad", "ci", "to", "mto", "bu", "dlu"]
+
+# Tabel yang bisa diexport: label -> nama tabel utils.export
+EXPORT_TABLES = {
+    "DDT": "ddt",
+    "LAT": "lat",
+    "BCT": "bct",
+    "DLCT": "dlct",
+    "Autokorelasi": "autocorrelation",
+}
+EXPORT_MIME = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".csv": "text/csv",
+    ".npz": "application/zip",
+}
+
+# Jumlah S-box yang hasil metriknya disimpan lintas rerun dan sesi
+MAX_CACHED_SBOXES = 32
+
+# Interval (detik) pemeriksaan metrik yang masih dihitung
+EVALUATION_POLL_SECONDS = 0.5
+
+
+@st.cache_resource
+def metric_pool():
+    """Thread pool bersama untuk menghitung metrik di semua sesi."""
+    return ThreadPoolExecutor(max_workers=min(len(METRICS), os.cpu_count() or 1))
+
+
+@st.cache_resource
+def metric_results():
+    """Future hasil metrik per hash S-box (LRU), dipakai lintas rerun dan sesi."""
+    return OrderedDict(), threading.Lock()
+
+
+def submit_metrics(sbox):
+    """
+    Kirim semua metrik S-box ke worker pool, atau ambil future yang sudah ada.
+    Scheduler membangun setiap tabel bersama sekali lalu menjalankan metrik
+    yang memakainya. Rerun yang terputus tidak membuang pekerjaan: future
+    tetap berjalan dan hasilnya dipakai oleh rerun berikutnya.
+    """
+    results, lock = metric_results()
+    with lock:
+        futures = results.get(sbox.digest)
+        if futures is None:
+            futures = schedule(sbox, METRICS, metric_pool())
+            results[sbox.digest] = futures
+            while len(results) > MAX_CACHED_SBOXES:
+                results.popitem(last=False)
+        else:
+            results.move_to_end(sbox.digest)
+    return futures
+
+
+def discard_failed_metrics(sbox, futures):
+    """Hapus future S-box dari cache jika ada metrik yang gagal, agar dihitung ulang."""
+    if not any(f.done() and f.exception() is not None for f in futures.values()):
+        return
+    results, lock = metric_results()
+    with lock:
+        if results.get(sbox.digest) is futures:
+            del results[sbox.digest]
+
+
+def render_metrics(futures):
+    """Tampilkan metrik yang sudah selesai; yang belum selesai ditandai "..."."""
+    for name in METRICS:
+        metric = REGISTRY[name]
+        future = futures[name]
+        if not future.done():
+            st.metric(metric.label, "...")
+        elif future.exception() is not None:
+            st.error(f"{metric.label}: {future.exception()}")
+        else:
+            st.metric(metric.label, metric.format(future.result()))
+
+
+@st.fragment(run_every=EVALUATION_POLL_SECONDS)
+def pending_evaluation(sbox):
+    """
+    Fragment yang memeriksa future metrik secara berkala tanpa menunggu,
+    sehingga bagian lain halaman (enkripsi, export) tetap bisa dipakai.
+    """
+    futures = submit_metrics(sbox)
+    if all(f.done() for f in futures.values()):
+        # Rerun penuh menampilkan hasil akhir tanpa polling
+        st.rerun()
+    render_metrics(futures)
+
+
+def render_evaluation(sbox):
+    """Tampilkan setiap metrik segera setelah selesai dihitung."""
+    futures = submit_metrics(sbox)
+    if all(f.done() for f in futures.values()):
+        render_metrics(futures)
+        discard_failed_metrics(sbox, futures)
+    else:
+        pending_evaluation(sbox)
+
+
+def deferred_export(write, suffix):
+    """
+    Callable untuk data st.download_button: export baru ditulis saat tombol
+    diklik (bukan di setiap rerun), lewat writer streaming utils.export ke
+    file sementara di disk, lalu isinya diserahkan ke Streamlit.
+    """
+    def generate():
+        with tempfile.TemporaryFile(suffix=suffix) as f:
+            write(f)
+            f.seek(0)
+            return f.read()
+    return generate
+
+
+@st.fragment
+def table_export_section(sbox):
+    """Export tabel lengkap (DDT, LAT, ...) secara streaming."""
+    st.subheader("Export Tabel")
+    col1, col2 = st.columns([3, 1])
+    labels = col1.multiselect("Tabel", list(EXPORT_TABLES), default=["DDT", "LAT"])
+    fmt = col2.selectbox("Format", list(EXPORT_MIME))
+
+    names = [EXPORT_TABLES[label] for label in labels]
+    if not names:
+        st.error("Pilih minimal satu tabel.")
+    elif fmt == ".csv" and len(names) != 1:
+        st.error("CSV hanya dapat berisi satu tabel.")
+    else:
+        st.download_button(
+            "Download tabel",
+            data=deferred_export(lambda dst: write_tables(dst, sbox, names, fmt), fmt),
+            file_name=f"sbox_{'_'.join(names)}{fmt}",
+            mime=EXPORT_MIME[fmt],
+            key="btn_export"
+        )
+
+
+def instrumentation_panel():
+    """Statistik instrumentasi di sidebar, hanya jika instrumentasi aktif."""
+    if not instrumentation.is_enabled():
+        return
+
+    sidebar = st.sidebar
+    sidebar.header("Instrumentasi")
+    stats = instrumentation.snapshot()
+    if not stats:
+        sidebar.caption("Belum ada pemanggilan yang tercatat.")
+        return
+
+    sidebar.dataframe(pd.DataFrame(
+        {
+            name: {
+                "Calls": values["calls"],
+                "Errors": values["errors"],
+                "Wall (s)": values["wall_seconds"],
+                "CPU (s)": values["cpu_seconds"],
+                "Max wall (s)": values["max_wall_seconds"],
+                "Peak (MB)": values["peak_bytes"] / 1e6,
+            }
+            for name, values in stats.items()
+        }
+    ).T.sort_values("Wall (s)", ascending=False))
+
+    sidebar.download_button(
+        "Download statistik (JSON)",
+        data=instrumentation.export_json(),
+        file_name="instrumentation.json",
+        mime="application/json"
+    )
+    profile = instrumentation.export_profile()
+    if profile is not None:
+        sidebar.download_button(
+            "Download cProfile (.prof)",
+            data=profile,
+            file_name="instrumentation.prof",
+            mime="application/octet-stream"
+        )
+    if sidebar.button("Reset statistik"):
+        instrumentation.reset()
+        st.rerun()
 
 
 def main():
@@ -58,6 +249,9 @@ def main():
                     st.warning(f"S-box {len(sbox)} elemen, dipotong ke 256.")
                     sbox = sbox[:256]
 
+                # Validasi rentang nilai (0..255) sebelum disimpan
+                SBox(sbox)
+
                 # SIMPAN DI SESSION STATE (PENTING)
                 st.session_state.sbox = sbox
 
@@ -81,31 +275,27 @@ def main():
         st.divider()
         st.header("S-box Cryptographic Evaluation")
 
-        sbox = st.session_state.sbox
-
-        st.metric("Nonlinearity", compute_nonlinearity(sbox))
-        st.metric("SAC", f"{strict_avalanche_criterion(sbox):.10f}")
-        st.metric("BIC-NL", calculate_bic_nl(sbox))
-        st.metric("BIC-SAC", f"{calculate_bic_sac(sbox):.10f}")
-        st.metric("LAP", f"{linear_approximation_probability(sbox):.6f}")
-        st.metric("DAP", f"{calculate_dap(sbox):.10f}")
-        st.metric("Algebraic Degree (AD)", compute_algebraic_degree(sbox))
-        st.metric("Correlation Immunity (CI)", compute_correlation_immunity(sbox))
-        st.metric("Transparency Order (TO)", f"{compute_transparency_order(sbox):.6f}")
-
-
-        export_df = pd.DataFrame(sbox)
-        buffer = io.BytesIO()
-        export_df.to_excel(buffer, index=False, header=False)
-        buffer.seek(0)
+        # Konversi sekali, dipakai bersama oleh semua metrik
+        sbox = SBox(st.session_state.sbox)
+        render_evaluation(sbox)
 
         st.download_button(
             "Download S-box",
-            data=buffer,
+            data=deferred_export(lambda dst: write_sbox(dst, sbox), ".xlsx"),
             file_name="sbox.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            mime=EXPORT_MIME[".xlsx"]
         )
+        table_export_section(sbox)
+
+    text_encryption_section()
+    image_encryption_section()
+    instrumentation_panel()
 
+
+# Fragment: interaksi widget enkripsi hanya menjalankan ulang bagian ini,
+# bukan seluruh halaman termasuk evaluasi S-box
+@st.fragment
+def text_encryption_section():
     # TEXT ENCRYPTION
     st.divider()
     st.header("AES Text Encryption")
@@ -122,18 +312,24 @@ def main():
         else:
             if mode == "Encrypt":
                 ciphertext = encrypt_text(text, key, st.session_state.sbox)
-                entropy_result = compute_entropy(ciphertext.encode())
-                entropy_value = entropy_result['shannon_entropy']
-                
+                entropy_value = byte_entropy(ciphertext.encode())
+
                 st.subheader("Ciphertext")
                 st.code(ciphertext)
                 st.metric("Entropy", f"{entropy_value:.4f}")
             else:
-                plaintext = decrypt_text(text, key)
-                st.subheader("Plaintext")
-                st.text(plaintext)
+                try:
+                    plaintext = decrypt_text(text, key, st.session_state.sbox)
+                except ValueError as e:
+                    st.error(f"Gagal mendekripsi: {e}")
+                else:
+                    st.subheader("Plaintext")
+                    st.text(plaintext)
+
 
-   # IMAGE ENCRYPTION
+@st.fragment
+def image_encryption_section():
+    # IMAGE ENCRYPTION
     st.divider()
     st.header("AES Image Encryption")
     
@@ -145,8 +341,8 @@ def main():
     )
     
     uploaded_img = st.file_uploader(
-        "Upload Image",
-        type=["png", "jpg", "jpeg"]
+        "Upload Image (atau cipher-image .sbxc untuk decrypt)",
+        type=["png", "jpg", "jpeg", "sbxc"]
     )
     
     img_key = st.text_input(
@@ -162,6 +358,21 @@ def main():
             st.error("Silakan upload image terlebih dahulu.")
         elif len(img_key.encode()) != 16:
             st.error("Key harus 16 byte (AES-128).")
+        elif uploaded_img.name.endswith(".sbxc"):
+            # Container cipher-image: dekripsi lossless tanpa re-padding
+            if img_mode == "Encrypt":
+                st.error("File .sbxc sudah terenkripsi, pilih mode Decrypt.")
+            else:
+                try:
+                    plain_img, _ = read_cipher_image(
+                        uploaded_img.getvalue(),
+                        img_key.encode(),
+                        st.session_state.sbox
+                    )
+                    st.subheader("Decrypted Image")
+                    st.image(plain_img, clamp=True)
+                except ValueError as e:
+                    st.error(f"Gagal mendekripsi: {e}")
         else:
             from PIL import Image
     
@@ -177,13 +388,9 @@ def main():
                     st.session_state.sbox
                 )
     
-                entropy_res = compute_entropy(cipher1)
-                npcr_res = calculate_npcr(cipher1, cipher2)
-                uaci_res = calculate_uaci(cipher1, cipher2)
-    
-                entropy_val = entropy_res['shannon_entropy']
-                npcr_val = npcr_res['npcr'] if isinstance(npcr_res, dict) else npcr_res
-                uaci_val = uaci_res['uaci'] if isinstance(uaci_res, dict) else uaci_res
+                # Entropy, NPCR, UACI, chi-square dan korelasi dalam satu pass
+                quality = image_metrics(cipher1, cipher2)
+                del cipher2
     
                 st.subheader("Cipher Image")
                 st.image(cipher1, clamp=True)
@@ -193,13 +400,36 @@ def main():
                 )
     
                 col1, col2, col3 = st.columns(3)
-                col1.metric("Entropy", f"{entropy_val:.4f}")
-                col2.metric("NPCR (%)", f"{npcr_val:.2f}")
-                col3.metric("UACI (%)", f"{uaci_val:.2f}")
+                col1.metric("Entropy", f"{quality['entropy']:.4f}")
+                col2.metric("NPCR (%)", f"{quality['npcr']:.2f}")
+                col3.metric("UACI (%)", f"{quality['uaci']:.2f}")
+
+                st.dataframe(
+                    pd.DataFrame(
+                        {
+                            "Chi-square": quality["chi_square"],
+                            **{
+                                f"Korelasi {direction}": values
+                                for direction, values in quality["correlation"].items()
+                            },
+                        },
+                        index=["R", "G", "B"],
+                    )
+                )
+
+                # Cipher-image PNG kehilangan blok terakhir yang dipadding,
+                # container .sbxc menyimpan ciphertext utuh
+                st.download_button(
+                    "Download Cipher Image (.sbxc)",
+                    data=encrypt_image_container(
+                        img_np, key_bytes, st.session_state.sbox, color_mode="RGB"
+                    ),
+                    file_name="cipher_image.sbxc",
+                    mime="application/octet-stream"
+                )
     
             else:
                 try:
-                    from utils.aes_image import decrypt_image
                     plain_img = decrypt_image(
                         img_np,
                         key_bytes,
@@ -208,11 +438,8 @@ def main():
                     
                     st.subheader("Decrypted Image")
                     st.image(plain_img, clamp=True)
-                except NotImplementedError:
-                    st.warning(
-                        "Fitur decrypt image belum diimplementasikan "
-                        "di utils.aes_image."
-                    )
+                except ValueError as e:
+                    st.error(f"Gagal mendekripsi: {e}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,399 @@
+"""
+Layanan HTTP/JSON lokal untuk metrik S-box dan enkripsi teks AES.
+
+Front end asyncio menerima request, job evaluasi masuk ke antrean
+terbatas, lalu dispatcher mengumpulkan job yang datang bersamaan menjadi
+satu batch kecil untuk process pool. S-box yang sama (digest dan daftar
+metrik) yang sedang diproses atau baru selesai tidak dihitung ulang:
+request berikutnya mendapat job yang sama.
+
+Endpoint:
+    GET  /health              status, ukuran antrean, jumlah job
+    GET  /metrics             daftar metrik
+    POST /evaluate            {"sbox": [...], "metrics": [...], "wait": true}
+    GET  /jobs/<id>           status dan hasil job
+    POST /encrypt, /decrypt   {"sbox": [...], "key": "...", "text": "..."}
+
+Contoh:
+    python server.py --port 8765 --workers 4
+    curl -s localhost:8765/evaluate -d '{"sbox": [...], "metrics": ["nl", "du"]}'
+    curl -s localhost:8765/evaluate -d '{"sbox": [...], "wait": false}'
+    curl -s localhost:8765/jobs/<id>
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from batch import WORKER_CACHE_ENTRIES, evaluate_sbox
+from utils.aes_text import encrypt_text, decrypt_text
+from utils.analysis import configure_cache, CACHE_DIR_ENV
+from utils.registry import METRICS
+from utils.sbox import SBox
+
+# Batas ukuran body request dan header
+MAX_BODY_BYTES = 1 << 22
+MAX_HEADER_LINES = 100
+
+DEFAULT_QUEUE_SIZE = 1024
+# Job yang selesai disimpan (LRU) untuk polling dan dedupe
+MAX_FINISHED_JOBS = 4096
+# Job per batch dan waktu tunggu maksimal untuk mengumpulkan satu batch
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_BATCH_WAIT = 0.01
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# WORKER
+
+def _init_worker(cache_dir):
+    configure_cache(cache_dir=cache_dir, max_entries=WORKER_CACHE_ENTRIES)
+
+
+def evaluate_jobs(items):
+    """
+    Evaluate a micro-batch of (job id, values, metrics) in one worker call.
+    S-boxes of one batch share the worker's analysis cache.
+
+    Returns:
+        dict: job id -> row from batch.evaluate_sbox
+    """
+    return {job_id: evaluate_sbox(values, metrics) for job_id, values, metrics in items}
+
+
+# JOBS
+
+class Job:
+    def __init__(self, sbox, metrics):
+        self.id = uuid.uuid4().hex
+        self.values = sbox.tolist()
+        self.digest = sbox.digest
+        self.metrics = metrics
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.done = asyncio.Event()
+
+    @property
+    def dedupe_key(self):
+        # Urutan metrik tidak mengubah hasil
+        return self.digest, tuple(sorted(self.metrics))
+
+    def to_dict(self):
+        data = {"id": self.id, "status": self.status, "digest": self.digest,
+                "metrics": list(self.metrics)}
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class EvaluationService:
+    """
+    Bounded job queue, in-flight dedupe and micro-batching dispatcher in
+    front of a process pool.
+    """
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                 batch_size=DEFAULT_BATCH_SIZE, batch_wait=DEFAULT_BATCH_WAIT):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.queue = asyncio.Queue(queue_size)
+        self.jobs = OrderedDict()
+        self.by_key = {}
+        # Worker dibuat lazily setelah socket listen terbuka; dengan fork mereka
+        # mewarisi fd listen dan koneksi klien sehingga respons tidak pernah EOF
+        # dan port tetap terikat. forkserver/spawn memulai proses bersih.
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(method),
+                                        initializer=_init_worker,
+                                        initargs=(os.environ.get(CACHE_DIR_ENV) or None,))
+        # Batch yang berjalan bersamaan dibatasi jumlah worker
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = None
+        self._running = set()
+
+    def start(self):
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        self.pool.shutdown(cancel_futures=True)
+
+    def submit(self, sbox, metrics):
+        """Queue an evaluation, or return the queued/finished job for the same input."""
+        job = Job(sbox, metrics)
+        existing = self.by_key.get(job.dedupe_key)
+        if existing is not None and existing.status != "error":
+            if existing.id in self.jobs:
+                self.jobs.move_to_end(existing.id)
+            return existing
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "Antrean penuh, coba lagi nanti")
+        self.jobs[job.id] = job
+        self.by_key[job.dedupe_key] = job
+        self._evict()
+        return job
+
+    def _evict(self):
+        # Buang job selesai yang paling lama tidak dipakai
+        while len(self.jobs) > MAX_FINISHED_JOBS:
+            for job_id, job in self.jobs.items():
+                if job.done.is_set():
+                    del self.jobs[job_id]
+                    if self.by_key.get(job.dedupe_key) is job:
+                        del self.by_key[job.dedupe_key]
+                    break
+            else:
+                return
+
+    async def _next_batch(self):
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.batch_wait
+        while len(batch) < self.batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _dispatch(self):
+        while True:
+            await self._slots.acquire()
+            batch = await self._next_batch()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch):
+        try:
+            for job in batch:
+                job.status = "running"
+            items = [(job.id, job.values, job.metrics) for job in batch]
+            loop = asyncio.get_running_loop()
+            try:
+                rows = await loop.run_in_executor(self.pool, evaluate_jobs, items)
+            except Exception as e:
+                rows = {job.id: {"error": f"{type(e).__name__}: {e}"} for job in batch}
+            for job in batch:
+                row = rows[job.id]
+                # Metrik yang gagal dilaporkan di "error", metrik lain tetap dikirim
+                result = {name: row[name] for name in job.metrics if name in row}
+                job.error = row.get("error") or None
+                if result:
+                    job.status, job.result = "done", result
+                else:
+                    job.status = "error"
+                job.done.set()
+        finally:
+            self._slots.release()
+
+    def status(self):
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "queued": self.queue.qsize(),
+            "jobs": len(self.jobs),
+        }
+
+
+# HTTP
+
+def _parse_sbox(body):
+    if not isinstance(body, dict) or "sbox" not in body:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Body harus berupa objek JSON dengan field 'sbox'")
+    try:
+        return SBox(body["sbox"])
+    except (TypeError, ValueError) as e:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"S-box tidak valid: {e}")
+
+
+def _parse_metrics(body):
+    metrics = body.get("metrics") or list(METRICS)
+    if isinstance(metrics, str):
+        metrics = [m.strip() for m in metrics.split(",") if m.strip()]
+    if not isinstance(metrics, list) or not all(isinstance(m, str) for m in metrics):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Field 'metrics' harus berupa list nama metrik")
+    unknown = [m for m in metrics if m not in METRICS]
+    if unknown:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Metrik tidak dikenal: {', '.join(unknown)}")
+    return list(dict.fromkeys(metrics))
+
+
+async def _read_request(reader):
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.split(" ", 2)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Request line tidak valid")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Terlalu banyak header")
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Content-Length tidak valid")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body terlalu besar")
+    body = None
+    if length:
+        try:
+            body = json.loads(await reader.readexactly(length))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Body bukan JSON yang valid")
+    return method.upper(), target.split("?", 1)[0], body
+
+
+async def _write_response(writer, status, payload):
+    data = json.dumps(payload).encode()
+    writer.write(
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        "Connection: close\r\n\r\n".encode("latin-1") + data
+    )
+    await writer.drain()
+
+
+class Server:
+    """Minimal asyncio HTTP front end of an EvaluationService."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def route(self, method, path, body):
+        service = self.service
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, service.status()
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, {"metrics": list(METRICS)}
+
+        if path == "/evaluate" and method == "POST":
+            sbox = _parse_sbox(body)
+            wait = body.get("wait", True)
+            if not isinstance(wait, bool):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Field 'wait' harus boolean")
+            job = service.submit(sbox, _parse_metrics(body))
+            if not wait:
+                return HTTPStatus.ACCEPTED, job.to_dict()
+            await job.done.wait()
+            status = HTTPStatus.OK if job.status == "done" else HTTPStatus.UNPROCESSABLE_ENTITY
+            return status, job.to_dict()
+
+        if path.startswith("/jobs/") and method == "GET":
+            job = service.jobs.get(path[len("/jobs/"):])
+            if job is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, "Job tidak ditemukan")
+            return HTTPStatus.OK, job.to_dict()
+
+        if path in ("/encrypt", "/decrypt") and method == "POST":
+            sbox = _parse_sbox(body)
+            key, text = body.get("key"), body.get("text")
+            if not isinstance(key, str) or len(key.encode()) != 16 or not isinstance(text, str):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Field 'key' (16 byte) dan 'text' wajib diisi")
+            func = encrypt_text if path == "/encrypt" else decrypt_text
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(service.pool, func, text, key, sbox.tolist())
+            except ValueError as e:
+                raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Gagal memproses teks: {e}")
+            return HTTPStatus.OK, {"text": result}
+
+        if path in ("/health", "/metrics", "/evaluate", "/encrypt", "/decrypt") or path.startswith("/jobs/"):
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Method {method} tidak didukung")
+        raise HttpError(HTTPStatus.NOT_FOUND, f"Endpoint tidak ditemukan: {path}")
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    return
+                status, payload = await self.route(*request)
+            except HttpError as e:
+                status, payload = e.status, {"error": str(e)}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except Exception as e:
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+            await _write_response(writer, status, payload)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host="127.0.0.1", port=8765, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                batch_size=DEFAULT_BATCH_SIZE, batch_wait=DEFAULT_BATCH_WAIT, ready=None):
+    """
+    Run the service until cancelled. `ready`, if given, is called with the
+    bound (host, port) once the socket listens, e.g. for port=0 in tests.
+    """
+    service = EvaluationService(workers, queue_size, batch_size, batch_wait)
+    service.start()
+    server = await asyncio.start_server(Server(service).handle, host, port)
+    try:
+        address = server.sockets[0].getsockname()[:2]
+        print(f"Melayani di http://{address[0]}:{address[1]}", file=sys.stderr)
+        if ready is not None:
+            ready(address)
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP/JSON evaluasi S-box")
+    parser.add_argument("--host", default="127.0.0.1", help="Alamat bind (default localhost)")
+    parser.add_argument("--port", type=int, default=8765, help="Port")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Jumlah proses worker")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Kapasitas antrean job")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Job maksimal per batch worker")
+    parser.add_argument("--batch-wait", type=float, default=DEFAULT_BATCH_WAIT,
+                        help="Detik menunggu job lain sebelum batch dikirim")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue_size,
+                          args.batch_size, args.batch_wait))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Uji server.py sepenuhnya di localhost: server dijalankan sebagai proses
+terpisah di port bebas, lalu setiap respons dibaca sampai EOF seperti
+klien yang tidak memakai Content-Length.
+
+    python -m unittest test_server
+"""
+import asyncio
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import unittest
+
+from utils.aes_core import RIJNDAEL_SBOX
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Batas waktu per request; respons yang menggantung membuat uji gagal
+TIMEOUT = 60
+
+
+async def _request(port, method, path, body=None):
+    """Send one request and read the response to EOF."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+    )
+    await writer.drain()
+    try:
+        raw = await asyncio.wait_for(reader.read(), TIMEOUT)
+    finally:
+        writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(payload)
+
+
+def request(port, method, path, body=None):
+    return asyncio.run(_request(port, method, path, body))
+
+
+class ServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.process = subprocess.Popen(
+            [sys.executable, "server.py", "--port", "0", "--workers", "2"],
+            cwd=HERE, stderr=subprocess.PIPE, text=True,
+        )
+        line = cls.process.stderr.readline()
+        match = re.search(r":(\d+)$", line.strip())
+        if match is None:
+            cls.process.kill()
+            raise RuntimeError(f"Server tidak mulai: {line!r}")
+        cls.port = int(match.group(1))
+        # Log server tetap dibaca agar pipe stderr tidak penuh
+        cls.drain = threading.Thread(target=cls.process.stderr.read, daemon=True)
+        cls.drain.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        # SIGINT menjalankan shutdown normal sehingga pool worker ikut berhenti
+        cls.process.send_signal(signal.SIGINT)
+        cls.process.wait(TIMEOUT)
+        cls.drain.join(TIMEOUT)
+        cls.process.stderr.close()
+
+    def test_first_evaluate_reads_to_eof(self):
+        status, payload = request(self.port, "POST", "/evaluate",
+                                  {"sbox": list(RIJNDAEL_SBOX), "metrics": ["nl", "du"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["result"], {"nl": 112, "du": 4})
+
+    def test_health(self):
+        status, payload = request(self.port, "GET", "/health")
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["status"], "ok")
+
+    def test_partial_metric_error(self):
+        status, payload = request(self.port, "POST", "/evaluate",
+                                  {"sbox": [0] * 256, "metrics": ["bu", "nl"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["result"], {"nl": 128})
+        self.assertIn("bu", payload["error"])
+
+    def test_invalid_requests(self):
+        sbox = list(RIJNDAEL_SBOX)
+        for body in ({"sbox": sbox, "metrics": 5}, {"sbox": sbox, "wait": "no"},
+                     {"sbox": "abc"}, {"metrics": ["nl"]}):
+            status, payload = request(self.port, "POST", "/evaluate", body)
+            self.assertEqual(status, 400, body)
+            self.assertIn("error", payload)
+
+    def test_encrypt_round_trip(self):
+        body = {"sbox": list(RIJNDAEL_SBOX), "key": "0123456789abcdef", "text": "halo"}
+        status, payload = request(self.port, "POST", "/encrypt", body)
+        self.assertEqual(status, 200)
+        status, payload = request(self.port, "POST", "/decrypt", dict(body, text=payload["text"]))
+        self.assertEqual((status, payload["text"]), (200, "halo"))
+
+
+if __name__ == "__main__":
+    unittest.main()
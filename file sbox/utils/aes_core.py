@@ -0,0 +1,151 @@
+import numpy as np
+from .sbox import SBox
+from .affine_generator import affine_sboxes, AES_MATRIX, AES_CONSTANT
+from .instrumentation import instrumented
+
+BLOCK_SIZE = 16
+ROUNDS = 10
+
+RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
+
+# Matriks MixColumns dan inversnya
+MIX = [[2, 3, 1, 1], [1, 2, 3, 1], [1, 1, 2, 3], [3, 1, 1, 2]]
+INV_MIX = [[14, 11, 13, 9], [9, 14, 11, 13], [13, 9, 14, 11], [11, 13, 9, 14]]
+
+
+def gf_mul(a, b):
+    """Multiply two elements of GF(2^8) modulo x^8 + x^4 + x^3 + x + 1."""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = ((a << 1) ^ 0x1B) & 0xFF if a & 0x80 else a << 1
+        b >>= 1
+    return result
+
+
+# Tabel perkalian GF(2^8) untuk setiap koefisien MixColumns
+_MUL = {c: np.array([gf_mul(x, c) for x in range(256)], dtype=np.uint32)
+        for c in (1, 2, 3, 9, 11, 13, 14)}
+
+
+# S-box Rijndael: affine (circulant 0xF1, konstanta 0x63) dari inversi GF(2^8)
+RIJNDAEL_SBOX = affine_sboxes(AES_MATRIX, AES_CONSTANT)[0].tolist()
+
+# Posisi byte state (indeks r + 4c) yang masuk ke kolom c setelah ShiftRows,
+# disusun per baris r agar setiap T-table membaca satu blok kontigu
+_SHIFT_ROWS = np.array([(r + 4 * ((c + r) % 4)) for r in range(4) for c in range(4)])
+_INV_SHIFT_ROWS = np.array([(r + 4 * ((c - r) % 4)) for r in range(4) for c in range(4)])
+# Urutan byte state (kolom per kolom) dari susunan per baris di atas
+_ROW_TO_STATE = np.array([r * 4 + c for c in range(4) for r in range(4)])
+
+
+def _round_tables(sbox, matrix):
+    """
+    T-tables: tables[k][x] is the MixColumns column contributed by byte
+    sbox[x] in row k, packed as a little-endian uint32 (row r in byte r).
+    """
+    sbox = np.asarray(sbox, dtype=np.intp)
+    tables = np.zeros((4, 256), dtype="<u4")
+    for k in range(4):
+        for r in range(4):
+            tables[k] |= _MUL[matrix[r][k]][sbox] << (8 * r)
+    return tables
+
+
+def _to_words(block):
+    """View (..., 16) state bytes as (..., 4) little-endian column words."""
+    return np.ascontiguousarray(block, dtype=np.uint8).view("<u4")
+
+
+class AESEngine:
+    """
+    AES-128 with a caller supplied 8-bit S-box, vectorized over blocks.
+
+    The key schedule, the encryption T-tables and (for bijective S-boxes)
+    the inverse S-box with its decryption T-tables are derived from the
+    S-box, so `AESEngine(key)` with the default Rijndael S-box is standard
+    AES-128. Blocks are processed as an (nblocks, 16) uint8 array.
+    """
+
+    def __init__(self, key, sbox=None):
+        if len(key) != 16:
+            raise ValueError("Key harus 16 byte (AES-128).")
+
+        sbox = SBox.coerce(RIJNDAEL_SBOX if sbox is None else sbox)
+        if sbox.n != 8 or sbox.m != 8:
+            raise ValueError("AES membutuhkan S-box 8x8.")
+        self.sbox = sbox.values
+        self.round_keys = self._expand_key(bytes(key))
+        self._enc_tables = _round_tables(self.sbox, MIX)
+
+        self.inv_sbox = None
+        self._dec_tables = None
+        self._dec_round_keys = None
+        if sbox.is_bijective():
+            self.inv_sbox = np.argsort(self.sbox).astype(np.uint8)
+            self._dec_tables = _round_tables(self.inv_sbox, INV_MIX)
+            self._dec_round_keys = self._inverse_round_keys()
+
+    def _expand_key(self, key):
+        words = [list(key[i:i + 4]) for i in range(0, 16, 4)]
+        for i in range(4, 4 * (ROUNDS + 1)):
+            temp = list(words[i - 1])
+            if i % 4 == 0:
+                temp = temp[1:] + temp[:1]
+                temp = [int(self.sbox[b]) for b in temp]
+                temp[0] ^= RCON[i // 4 - 1]
+            words.append([a ^ b for a, b in zip(words[i - 4], temp)])
+        return np.array(words, dtype=np.uint8).reshape(ROUNDS + 1, 16)
+
+    def _inverse_round_keys(self):
+        # Equivalent inverse cipher: InvMixColumns pada round key 1..9
+        keys = self.round_keys.copy()
+        for rnd in range(1, ROUNDS):
+            column = keys[rnd].reshape(4, 4).astype(np.intp)
+            mixed = np.zeros((4, 4), dtype=np.uint32)
+            for r in range(4):
+                for k in range(4):
+                    mixed[:, r] ^= _MUL[INV_MIX[r][k]][column[:, k]]
+            keys[rnd] = mixed.astype(np.uint8).ravel()
+        return keys
+
+    @staticmethod
+    def _rounds(state, tables, round_keys, sbox, shift):
+        state = state ^ round_keys[0]
+        key_words = _to_words(round_keys)
+        for rnd in range(1, ROUNDS):
+            shifted = np.ascontiguousarray(state[:, shift].reshape(-1, 4, 4).transpose(1, 0, 2))
+            words = tables[0][shifted[0]]
+            words ^= tables[1][shifted[1]]
+            words ^= tables[2][shifted[2]]
+            words ^= tables[3][shifted[3]]
+            words ^= key_words[rnd]
+            state = words.view(np.uint8).reshape(-1, BLOCK_SIZE)
+        return sbox[state[:, shift[_ROW_TO_STATE]]] ^ round_keys[ROUNDS]
+
+    @instrumented("aes.encrypt_blocks")
+    def encrypt_blocks(self, blocks):
+        """Encrypt an (nblocks, 16) uint8 array, returns a new array."""
+        blocks = np.asarray(blocks, dtype=np.uint8).reshape(-1, BLOCK_SIZE)
+        return self._rounds(blocks, self._enc_tables, self.round_keys,
+                            self.sbox, _SHIFT_ROWS)
+
+    @instrumented("aes.decrypt_blocks")
+    def decrypt_blocks(self, blocks):
+        """Decrypt an (nblocks, 16) uint8 array, returns a new array."""
+        if self.inv_sbox is None:
+            raise ValueError("S-box tidak bijektif, dekripsi tidak mungkin.")
+        blocks = np.asarray(blocks, dtype=np.uint8).reshape(-1, BLOCK_SIZE)
+        return self._rounds(blocks, self._dec_tables, self._dec_round_keys[::-1],
+                            self.inv_sbox, _INV_SHIFT_ROWS)
+
+    def encrypt_ecb(self, data):
+        """Encrypt bytes whose length is a multiple of 16 in ECB mode."""
+        blocks = np.frombuffer(data, dtype=np.uint8).reshape(-1, BLOCK_SIZE)
+        return self.encrypt_blocks(blocks).tobytes()
+
+    def decrypt_ecb(self, data):
+        """Decrypt bytes whose length is a multiple of 16 in ECB mode."""
+        blocks = np.frombuffer(data, dtype=np.uint8).reshape(-1, BLOCK_SIZE)
+        return self.decrypt_blocks(blocks).tobytes()
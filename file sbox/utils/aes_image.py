@@ -1,18 +1,18 @@
 import numpy as np
-from Crypto.Cipher import AES
+from .aes_core import AESEngine, BLOCK_SIZE
 
 def encrypt_image(img_array, key_bytes, sbox):
     """
-    Encrypt image menggunakan AES-128 ECB
+    Encrypt image menggunakan AES-128 ECB dengan S-box yang diberikan
     """
     flat = img_array.flatten().astype(np.uint8)
-    cipher = AES.new(key_bytes, AES.MODE_ECB)
+    cipher = AESEngine(key_bytes, sbox)
 
-    pad_len = (16 - len(flat) % 16) % 16
+    pad_len = (BLOCK_SIZE - len(flat) % BLOCK_SIZE) % BLOCK_SIZE
     flat_padded = np.pad(flat, (0, pad_len), mode='constant')
 
-    encrypted = cipher.encrypt(flat_padded.tobytes())
-    enc_array = np.frombuffer(encrypted, dtype=np.uint8)[:flat.size]
+    encrypted = cipher.encrypt_blocks(flat_padded.reshape(-1, BLOCK_SIZE))
+    enc_array = encrypted.reshape(-1)[:flat.size]
     
     return enc_array.reshape(img_array.shape)
 
@@ -21,12 +21,12 @@ def decrypt_image(cipher_img, key_bytes, sbox):
     Decrypt image AES (inverse dari encrypt_image)
     """
     flat = cipher_img.flatten().astype(np.uint8)
-    cipher = AES.new(key_bytes, AES.MODE_ECB)
+    cipher = AESEngine(key_bytes, sbox)
 
-    pad_len = (16 - len(flat) % 16) % 16
+    pad_len = (BLOCK_SIZE - len(flat) % BLOCK_SIZE) % BLOCK_SIZE
     flat_padded = np.pad(flat, (0, pad_len), mode='constant')
 
-    decrypted = cipher.decrypt(flat_padded.tobytes())
-    dec_array = np.frombuffer(decrypted, dtype=np.uint8)[:flat.size]
+    decrypted = cipher.decrypt_blocks(flat_padded.reshape(-1, BLOCK_SIZE))
+    dec_array = decrypted.reshape(-1)[:flat.size]
 
     return dec_array.reshape(cipher_img.shape)
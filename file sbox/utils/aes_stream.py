@@ -0,0 +1,202 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .aes_core import AESEngine, BLOCK_SIZE
+
+# Ukuran chunk default (kelipatan 16 byte)
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def iter_chunks(src, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield consecutive uint8 chunks of `chunk_size` bytes from a file-like
+    object (anything with `readinto`) or a buffer such as bytes, memoryview,
+    a NumPy array or an np.memmap. Buffers are sliced without copying, so
+    only the chunks being processed are paged in.
+    """
+    if hasattr(src, "readinto"):
+        while True:
+            chunk = bytearray(chunk_size)
+            view = memoryview(chunk)
+            filled = 0
+            while filled < chunk_size:
+                n = src.readinto(view[filled:])
+                if not n:
+                    break
+                filled += n
+            if not filled:
+                return
+            yield np.frombuffer(chunk, dtype=np.uint8, count=filled)
+            if filled < chunk_size:
+                return
+    else:
+        data = np.frombuffer(memoryview(src).cast("B"), dtype=np.uint8)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+
+def ctr_keystream(engine, nonce, start_block, nblocks):
+    """
+    Keystream blocks start_block .. start_block + nblocks - 1 of CTR mode,
+    with counter block = nonce (8 bytes) || counter (8 bytes, big-endian),
+    the same layout as PyCryptodome's AES.MODE_CTR with an 8-byte nonce.
+    """
+    counters = np.arange(start_block, start_block + nblocks, dtype=">u8")
+    blocks = np.empty((nblocks, BLOCK_SIZE), dtype=np.uint8)
+    blocks[:, :8] = np.frombuffer(nonce, dtype=np.uint8)
+    blocks[:, 8:] = counters.view(np.uint8).reshape(-1, 8)
+    return engine.encrypt_blocks(blocks)
+
+
+def _ctr_chunk(engine, nonce, start_block, chunk):
+    nblocks = -(-len(chunk) // BLOCK_SIZE)
+    keystream = ctr_keystream(engine, nonce, start_block, nblocks).reshape(-1)
+    return chunk ^ keystream[:len(chunk)]
+
+
+def _cbc_decrypt_chunk(engine, previous, chunk):
+    blocks = chunk.reshape(-1, BLOCK_SIZE)
+    chained = np.concatenate([previous[None, :], blocks[:-1]])
+    return (engine.decrypt_blocks(blocks) ^ chained).reshape(-1)
+
+
+def _ordered_map(func, jobs, workers):
+    """
+    Run func(*job) on a thread pool and yield the results in job order,
+    with at most 2 * workers jobs in flight so memory stays bounded.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(func, *job))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def ctr_transform(chunks, key, sbox, nonce, workers=None):
+    """
+    Encrypt or decrypt (CTR is symmetric) an iterable of uint8 chunks.
+    Every chunk except the last must be a multiple of 16 bytes. Yields
+    the output chunks in order.
+    """
+    if len(nonce) != 8:
+        raise ValueError("Nonce CTR harus 8 byte.")
+    engine = AESEngine(key, sbox)
+
+    def jobs():
+        block = 0
+        partial = False
+        for chunk in chunks:
+            if partial:
+                raise ValueError("Hanya chunk terakhir yang boleh tidak kelipatan 16 byte.")
+            yield engine, nonce, block, chunk
+            block += len(chunk) // BLOCK_SIZE
+            partial = len(chunk) % BLOCK_SIZE != 0
+
+    return _ordered_map(_ctr_chunk, jobs(), workers)
+
+
+def cbc_decrypt_transform(chunks, key, sbox, iv, workers=None):
+    """
+    Decrypt an iterable of CBC ciphertext chunks (each a multiple of 16
+    bytes). Every block only needs the previous ciphertext block, so the
+    chunks are decrypted in parallel. Yields plaintext chunks in order.
+    """
+    if len(iv) != BLOCK_SIZE:
+        raise ValueError("IV CBC harus 16 byte.")
+    engine = AESEngine(key, sbox)
+
+    def jobs():
+        previous = np.frombuffer(iv, dtype=np.uint8)
+        for chunk in chunks:
+            if len(chunk) % BLOCK_SIZE:
+                raise ValueError("Ciphertext CBC harus kelipatan 16 byte.")
+            yield engine, previous, chunk
+            previous = chunk[-BLOCK_SIZE:].copy()
+
+    return _ordered_map(_cbc_decrypt_chunk, jobs(), workers)
+
+
+def _write_all(outputs, dst):
+    written = 0
+    for out in outputs:
+        dst.write(out.tobytes())
+        written += len(out)
+    return written
+
+
+def ctr_stream(src, dst, key, sbox, nonce, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    CTR-encrypt (or decrypt) `src` into the file-like `dst` chunk by chunk.
+    Peak memory is about 2 * workers * chunk_size, independent of input size.
+
+    Returns:
+        int: number of bytes written
+    """
+    if chunk_size % BLOCK_SIZE:
+        raise ValueError("chunk_size harus kelipatan 16 byte.")
+    return _write_all(ctr_transform(iter_chunks(src, chunk_size), key, sbox, nonce, workers), dst)
+
+
+def cbc_decrypt_stream(src, dst, key, sbox, iv, chunk_size=DEFAULT_CHUNK_SIZE,
+                       workers=None, unpad=True):
+    """
+    CBC-decrypt `src` into the file-like `dst` chunk by chunk. With
+    unpad=True the PKCS#7 padding of the final block is removed.
+
+    Returns:
+        int: number of bytes written
+    """
+    if chunk_size % BLOCK_SIZE:
+        raise ValueError("chunk_size harus kelipatan 16 byte.")
+    outputs = cbc_decrypt_transform(iter_chunks(src, chunk_size), key, sbox, iv, workers)
+    if not unpad:
+        return _write_all(outputs, dst)
+
+    # Tahan chunk terakhir sampai diketahui bahwa itu memang yang terakhir
+    written = 0
+    last = None
+    for out in outputs:
+        if last is not None:
+            written += _write_all([last], dst)
+        last = out
+    if last is None or not len(last):
+        raise ValueError("Ciphertext kosong.")
+    pad_len = int(last[-1])
+    if not 1 <= pad_len <= BLOCK_SIZE or np.any(last[-pad_len:] != pad_len):
+        raise ValueError("Padding PKCS#7 tidak valid.")
+    return written + _write_all([last[:-pad_len]], dst)
+
+
+def ctr_image(img_array, key, sbox, nonce, out=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              workers=None):
+    """
+    CTR-encrypt (or decrypt) the raw bytes of an image array, which may be
+    an np.memmap, into `out` (allocated with the same shape and dtype when
+    None, or e.g. an np.memmap created with np.lib.format.open_memmap). CTR
+    needs no padding, so the cipher image keeps the exact shape, dtype and
+    size. Input and `out` must be C-contiguous so both are streamed through
+    flat byte views without copying.
+    """
+    if not img_array.flags.c_contiguous:
+        raise ValueError("Input harus C-contiguous.")
+    if out is None:
+        out = np.empty(img_array.shape, dtype=img_array.dtype)
+    if out.shape != img_array.shape or out.dtype != img_array.dtype:
+        raise ValueError("Output harus mempunyai shape dan dtype yang sama dengan input.")
+    if not out.flags.c_contiguous:
+        # reshape(-1) akan membuat salinan dan ciphertext hilang
+        raise ValueError("Output harus C-contiguous.")
+
+    flat_out = out.reshape(-1).view(np.uint8)
+    offset = 0
+    for chunk in ctr_transform(iter_chunks(img_array, chunk_size), key, sbox, nonce, workers):
+        flat_out[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+    return out
@@ -0,0 +1,186 @@
+"""
+Generator S-box dari transformasi affine inversi GF(2^8):
+
+    S(x) = A . x^(-1) xor c
+
+dengan A matriks biner 8x8 dan c konstanta 8-bit, seperti S-box AES
+(A = circulant 0xF1, c = 0x63) dan S-box44 (A = K44, c = 0x63).
+
+Konvensi bit: bit 0 adalah LSB. Baris r matriks menghasilkan bit output r
+dan kolom k adalah koefisien bit input k, sehingga sebuah baris dapat
+ditulis sebagai mask 8-bit (bit k = koefisien kolom k).
+"""
+import numpy as np
+
+# Polinomial tak tereduksi AES: x^8 + x^4 + x^3 + x + 1
+GF_POLY = 0x11B
+# Generator grup multiplikatif GF(2^8)* untuk polinomial di atas
+GF_GENERATOR = 3
+
+AES_CONSTANT = 0x63
+
+
+def _gf_tables():
+    exp = np.zeros(510, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int16)
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        # x * 3 = x * 2 xor x
+        doubled = x << 1
+        if doubled & 0x100:
+            doubled ^= GF_POLY
+        x = doubled ^ x
+    # Disalin sekali lagi agar exp[log a + log b] tidak perlu modulo 255
+    exp[255:] = exp[:255]
+
+    inverse = np.zeros(256, dtype=np.uint8)
+    inverse[1:] = exp[255 - log[1:]]
+    return exp, log, inverse
+
+
+GF_EXP, GF_LOG, GF_INV = _gf_tables()
+
+
+def gf_multiply(a, b):
+    """Vectorized multiplication in GF(2^8) using the log/exp tables."""
+    a = np.asarray(a, dtype=np.intp)
+    b = np.asarray(b, dtype=np.intp)
+    product = GF_EXP[GF_LOG[a] + GF_LOG[b]]
+    return np.where((a == 0) | (b == 0), 0, product).astype(np.uint8)
+
+
+def gf_inverse(x):
+    """Vectorized multiplicative inverse in GF(2^8), with 0 mapped to 0."""
+    return GF_INV[np.asarray(x, dtype=np.intp)]
+
+
+# MATRIKS AFFINE
+
+def matrix_from_rows(rows):
+    """
+    Bit matrices from row masks.
+
+    Args:
+        rows: array (..., 8) of 8-bit row masks
+
+    Returns:
+        np.ndarray: uint8 array (..., 8, 8) with M[..., r, k] = bit k of rows[..., r]
+    """
+    rows = np.asarray(rows, dtype=np.uint8)
+    return np.unpackbits(rows[..., None], axis=-1, bitorder="little")
+
+
+def matrix_rows(matrices):
+    """Inverse of matrix_from_rows: (..., 8, 8) bit matrices -> (..., 8) row masks."""
+    return np.packbits(np.asarray(matrices, dtype=np.uint8), axis=-1, bitorder="little")[..., 0]
+
+
+def circulant_matrices(first_rows=None):
+    """
+    Circulant matrices whose row r is the first row rotated left by r bits,
+    the structure of the AES and K44 matrices. Without arguments all 256
+    first rows are returned.
+    """
+    first_rows = np.arange(256) if first_rows is None else np.atleast_1d(first_rows)
+    first_rows = np.asarray(first_rows, dtype=np.intp)
+    shifts = np.arange(8)
+    rows = ((first_rows[:, None] << shifts) | (first_rows[:, None] >> (8 - shifts))) & 0xFF
+    return matrix_from_rows(rows)
+
+
+def random_matrices(count, rng=None):
+    """`count` uniformly random 8x8 bit matrices (not necessarily invertible)."""
+    rng = np.random.default_rng(rng)
+    return rng.integers(0, 2, size=(count, 8, 8), dtype=np.uint8)
+
+
+AES_MATRIX = circulant_matrices(0xF1)[0]
+K44_MATRIX = circulant_matrices(0xEA)[0]
+
+
+# PEMBANGKIT S-BOX
+
+# Bit-bit x^(-1) untuk semua 256 input, (8, 256)
+_INVERSE_BITS = np.unpackbits(GF_INV[None, :], axis=0, bitorder="little")
+
+
+def affine_sboxes(matrices, constants=AES_CONSTANT, base=None):
+    """
+    S-boxes A . base(x) xor c for a batch of matrices, over all 256 inputs
+    at once as one bit-matrix product.
+
+    Args:
+        matrices: (k, 8, 8) or (8, 8) bit matrices
+        constants: scalar or (k,) affine constants
+        base: 256 base values, default the GF(2^8) inverse
+
+    Returns:
+        np.ndarray: uint8 array (k, 256)
+    """
+    matrices = np.asarray(matrices, dtype=np.uint8).reshape(-1, 8, 8)
+    if base is None:
+        base_bits = _INVERSE_BITS
+    else:
+        base = np.asarray(base, dtype=np.uint8)
+        base_bits = np.unpackbits(base[None, :], axis=0, bitorder="little")
+
+    # (k, 8, 8) @ (8, 256): setiap entri paling besar 8, cukup uint8
+    bits = (matrices @ base_bits) & 1
+    sboxes = np.packbits(bits, axis=1, bitorder="little")[:, 0, :]
+    constants = np.asarray(constants, dtype=np.uint8).reshape(-1, 1)
+    return sboxes ^ constants
+
+
+def bijective_mask(sboxes):
+    """Boolean mask of the rows of a (k, 256) array that are permutations."""
+    sboxes = np.asarray(sboxes)
+    return np.all(np.sort(sboxes, axis=1) == np.arange(sboxes.shape[1]), axis=1)
+
+
+def generate_affine_sboxes(matrices, constants=AES_CONSTANT, chunk_size=4096):
+    """
+    Yield (indices, sboxes) blocks of the bijective affine S-boxes built
+    from `matrices`, processed `chunk_size` matrices at a time.
+    `indices` are the positions of the kept matrices in the input.
+    """
+    matrices = np.asarray(matrices, dtype=np.uint8).reshape(-1, 8, 8)
+    constants = np.broadcast_to(np.asarray(constants, dtype=np.uint8), (len(matrices),))
+    for start in range(0, len(matrices), chunk_size):
+        stop = start + chunk_size
+        sboxes = affine_sboxes(matrices[start:stop], constants[start:stop])
+        keep = bijective_mask(sboxes)
+        yield np.flatnonzero(keep) + start, sboxes[keep]
+
+
+def affine_sbox_id(matrix, constant=AES_CONSTANT):
+    """Readable id of an affine S-box: hex row masks and the constant, e.g. 'ead5ab57ae5dba75-63'."""
+    return f"{bytes(matrix_rows(matrix)).hex()}-{int(constant):02x}"
+
+
+def iter_affine_family(matrices, constants=AES_CONSTANT, chunk_size=4096):
+    """
+    Yield (id, values) for every bijective affine S-box, the same format
+    as batch.iter_sboxes, so a family can be fed straight into the metrics.
+    """
+    matrices = np.asarray(matrices, dtype=np.uint8).reshape(-1, 8, 8)
+    constants = np.broadcast_to(np.asarray(constants, dtype=np.uint8), (len(matrices),))
+    for indices, sboxes in generate_affine_sboxes(matrices, constants, chunk_size):
+        for index, values in zip(indices, sboxes):
+            yield affine_sbox_id(matrices[index], constants[index]), values.tolist()
+
+
+def affine_family(name, count=None, seed=None):
+    """
+    Named matrix families for sweeps:
+        'circulant' - all 256 circulant matrices
+        'random'    - `count` random matrices from `seed`
+    """
+    if name == "circulant":
+        return circulant_matrices()
+    if name == "random":
+        if not count:
+            raise ValueError("Family 'random' membutuhkan jumlah matriks (count).")
+        return random_matrices(count, seed)
+    raise ValueError(f"Family matriks tidak dikenal: {name}")
@@ -1,31 +1,42 @@
 import numpy as np
+from .analysis import get_analysis
+from .anf import anf_degrees
 
 def compute_algebraic_degree(sbox):
     """
     Menghitung Algebraic Degree dari S-box (n x n).
     Menggunakan Fast Mobius Transform.
     """
-    size = len(sbox)
-    n = int(np.log2(size)) 
-    max_degree = 0
-    # Untuk setiap bit output (ada n bit output)
-    for bit in range(n):
-        truth_table = [(x >> bit) & 1 for x in sbox]
-        # Fast Mobius Transform (ANF construction)
-        anf = list(truth_table)
-        for i in range(n):
-            for j in range(size):
-                if (j & (1 << i)):
-                    anf[j] = (anf[j] + anf[j ^ (1 << i)]) % 2
-        
-        # Hitung Hamming Weight dari input index dimana ANF bernilai 1
-        current_max = 0
-        for i in range(size):
-            if anf[i] == 1:
-                weight = bin(i).count('1')
-                if weight > current_max:
-                    current_max = weight
-        
-        if current_max > max_degree:
-            max_degree = current_max
-    return max_degree
+    # ANF semua bit output sekaligus (Fast Mobius Transform)
+    anf = get_analysis(sbox).anf
+
+    # Degree = Hamming weight terbesar dari input index dimana ANF bernilai 1
+    degrees = anf_degrees(anf)
+
+    return int(degrees.max())
+
+def algebraic_degree_profile(sbox):
+    """
+    Degree data of all component functions b.S(x), b != 0.
+
+    Returns:
+        dict: min_degree / max_degree over all components, the degree of
+              every coordinate (output bit) and the degree distribution
+              {degree: number of components}
+    """
+    analysis = get_analysis(sbox)
+
+    # ANF semua 2^m - 1 fungsi komponen, diturunkan dari ANF koordinat
+    # (per blok untuk S-box besar)
+    component_degrees = np.concatenate([
+        anf_degrees(rows)
+        for _, rows in analysis.component_anf_rows(np.arange(1, 1 << analysis.sbox.m))
+    ])
+    values, counts = np.unique(component_degrees, return_counts=True)
+
+    return {
+        'min_degree': int(component_degrees.min()),
+        'max_degree': int(component_degrees.max()),
+        'coordinate_degrees': anf_degrees(analysis.anf).tolist(),
+        'distribution': {int(d): int(c) for d, c in zip(values, counts)},
+    }
@@ -0,0 +1,242 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .anf import anf_table, component_anf_table
+from .boomerang import boomerang_connectivity_table, iter_boomerang_table
+from .difference_table import difference_distribution_table, iter_difference_table
+from .helpers import iter_row_chunks
+from .sbox import SBox
+from .walsh import (walsh_spectrum, autocorrelation_from_spectrum, iter_walsh_spectrum,
+                    linear_approximation_rows, differential_linear_rows)
+
+# Direktori cache di disk, kosong berarti cache hanya di memori
+CACHE_DIR_ENV = "SBOX_CACHE_DIR"
+DEFAULT_MAX_ENTRIES = 64
+
+# Tabel 2^m x 2^n di atas ukuran ini tidak dibangun penuh, barisnya
+# dihitung bertahap lewat *_rows()
+MAX_TABLE_ENTRIES = 1 << 22
+
+_lock = threading.RLock()
+_analyses = OrderedDict()
+_config = {
+    "cache_dir": os.environ.get(CACHE_DIR_ENV) or None,
+    "max_entries": DEFAULT_MAX_ENTRIES,
+}
+
+
+def _confusion_coefficients(analysis):
+    # utils.side_channel memakai modul ini, jadi baru di-import saat dibutuhkan
+    from .side_channel import confusion_coefficient_table
+    return confusion_coefficient_table(analysis.sbox)
+
+
+class SboxAnalysis:
+    """
+    Lazily computed, memoized tables of one S-box.
+
+    Every table is built at most once per process. When a cache directory
+    is configured the tables are also stored as `.npy` files named after
+    the S-box digest and loaded back memory-mapped, so another process
+    (or a later run) reuses them without recomputing.
+    """
+
+    # Nama tabel -> fungsi pembangun (menerima SboxAnalysis)
+    BUILDERS = {
+        "walsh": lambda analysis: walsh_spectrum(analysis.sbox),
+        "lat": lambda analysis: analysis.walsh.T // 2,
+        "autocorrelation": lambda analysis: autocorrelation_from_spectrum(analysis.walsh),
+        "ddt": lambda analysis: difference_distribution_table(analysis.sbox),
+        "anf": lambda analysis: anf_table(analysis.sbox),
+        "component_anf": lambda analysis: component_anf_table(analysis.anf),
+        "bct": lambda analysis: boomerang_connectivity_table(analysis.sbox),
+        "dlct": lambda analysis: analysis.autocorrelation.T // 2,
+        "confusion": lambda analysis: _confusion_coefficients(analysis),
+    }
+
+    # Tabel berukuran 2^m x 2^n
+    FULL_TABLES = {"walsh", "lat", "autocorrelation", "ddt", "component_anf", "bct", "dlct"}
+
+    def __init__(self, sbox, cache_dir=None):
+        self.sbox = SBox.coerce(sbox)
+        self.digest = self.sbox.digest
+        self.cache_dir = cache_dir
+        self._tables = {}
+        self._lock = threading.RLock()
+
+    def table(self, name):
+        """Return table `name`, loading or computing it on first use."""
+        if name not in self.BUILDERS:
+            raise KeyError(f"Unknown table: {name}")
+        if name in self.FULL_TABLES and not self.fits():
+            raise ValueError(f"Table {name} of a {self.sbox.n}x{self.sbox.m} S-box "
+                             "is too large, iterate over its rows instead")
+
+        with self._lock:
+            table = self._tables.get(name)
+            if table is None:
+                table = self._load(name)
+                if table is None:
+                    table = np.asarray(self.BUILDERS[name](self))
+                    table.flags.writeable = False
+                    self._save(name, table)
+                self._tables[name] = table
+            return table
+
+    @property
+    def walsh(self):
+        return self.table("walsh")
+
+    @property
+    def lat(self):
+        return self.table("lat")
+
+    @property
+    def autocorrelation(self):
+        return self.table("autocorrelation")
+
+    @property
+    def ddt(self):
+        return self.table("ddt")
+
+    @property
+    def bct(self):
+        return self.table("bct")
+
+    @property
+    def dlct(self):
+        return self.table("dlct")
+
+    @property
+    def anf(self):
+        return self.table("anf")
+
+    @property
+    def component_anf(self):
+        return self.table("component_anf")
+
+    def fits(self):
+        """Whether the full 2^m x 2^n tables are small enough to build and cache."""
+        return (self.sbox.size << self.sbox.m) <= MAX_TABLE_ENTRIES
+
+    def _rows(self, name, indices, stream):
+        # Tabel kecil: ambil dari tabel penuh yang di-cache,
+        # tabel besar: hitung blok demi blok
+        if self.fits():
+            table = self.table(name)
+            yield indices, table if len(indices) == len(table) else table[indices]
+        else:
+            yield from stream(indices)
+
+    def walsh_rows(self, masks=None):
+        """Yield (masks, W[masks]) blocks of the Walsh spectrum."""
+        masks = np.arange(1 << self.sbox.m) if masks is None else np.asarray(masks)
+        return self._rows("walsh", masks, lambda idx: iter_walsh_spectrum(self.sbox, idx))
+
+    def autocorrelation_rows(self, masks=None):
+        """Yield (masks, AC[masks]) blocks of the autocorrelation table."""
+        masks = np.arange(1 << self.sbox.m) if masks is None else np.asarray(masks)
+
+        def stream(idx):
+            for chunk, rows in iter_walsh_spectrum(self.sbox, idx):
+                yield chunk, autocorrelation_from_spectrum(rows)
+
+        return self._rows("autocorrelation", masks, stream)
+
+    def ddt_rows(self, deltas=None):
+        """Yield (deltas, DDT[deltas]) blocks of the difference distribution table."""
+        deltas = np.arange(self.sbox.size) if deltas is None else np.asarray(deltas)
+        return self._rows("ddt", deltas, lambda idx: iter_difference_table(self.sbox, idx))
+
+    def bct_rows(self, deltas=None):
+        """Yield (deltas, BCT[deltas]) blocks of the boomerang connectivity table."""
+        deltas = np.arange(self.sbox.size) if deltas is None else np.asarray(deltas)
+        return self._rows("bct", deltas, lambda idx: iter_boomerang_table(self.sbox, idx))
+
+    def lat_rows(self, masks=None):
+        """Yield (masks, LAT[masks]) blocks, rows by input mask a."""
+        masks = np.arange(self.sbox.size) if masks is None else np.asarray(masks)
+
+        def stream(idx):
+            for chunk in iter_row_chunks(idx, max(self.sbox.size, 1 << self.sbox.m)):
+                yield chunk, linear_approximation_rows(self.sbox, chunk)
+
+        return self._rows("lat", masks, stream)
+
+    def dlct_rows(self, deltas=None):
+        """Yield (deltas, DLCT[deltas]) blocks, rows by input difference a."""
+        deltas = np.arange(self.sbox.size) if deltas is None else np.asarray(deltas)
+
+        def stream(idx):
+            for chunk in iter_row_chunks(idx, max(self.sbox.size, 1 << self.sbox.m)):
+                yield chunk, differential_linear_rows(self.sbox, chunk)
+
+        return self._rows("dlct", deltas, stream)
+
+    def component_anf_rows(self, masks=None):
+        """Yield (masks, ANF of b.S for b in masks) blocks."""
+        masks = np.arange(1 << self.sbox.m) if masks is None else np.asarray(masks)
+
+        def stream(idx):
+            for chunk in iter_row_chunks(idx, self.sbox.size):
+                yield chunk, component_anf_table(self.anf, chunk)
+
+        return self._rows("component_anf", masks, stream)
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, self.digest[:2], f"{self.digest}.{name}.npy")
+
+    def _load(self, name):
+        if not self.cache_dir:
+            return None
+        try:
+            return np.load(self._path(name), mmap_mode="r")
+        except (OSError, ValueError):
+            # Belum ada di cache atau file rusak, hitung ulang
+            return None
+
+    def _save(self, name, table):
+        if not self.cache_dir:
+            return
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Tulis ke file sementara lalu rename, agar proses lain tidak
+        # pernah membaca file yang setengah tertulis
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, table)
+        os.replace(tmp_path, path)
+
+
+def configure_cache(cache_dir=None, max_entries=None):
+    """
+    Set the on-disk cache directory and the size of the in-memory LRU.
+    Passing cache_dir=None keeps the cache in memory only.
+    """
+    with _lock:
+        _config["cache_dir"] = cache_dir
+        if max_entries is not None:
+            _config["max_entries"] = max_entries
+        _analyses.clear()
+
+
+def get_analysis(sbox):
+    """
+    Return the shared SboxAnalysis for `sbox`, keyed by its content hash.
+    The least recently used analyses are evicted beyond `max_entries`.
+    """
+    sbox = SBox.coerce(sbox)
+    with _lock:
+        analysis = _analyses.get(sbox.digest)
+        if analysis is None:
+            analysis = SboxAnalysis(sbox, cache_dir=_config["cache_dir"])
+            _analyses[sbox.digest] = analysis
+            while len(_analyses) > _config["max_entries"]:
+                _analyses.popitem(last=False)
+        else:
+            _analyses.move_to_end(sbox.digest)
+        return analysis
@@ -0,0 +1,49 @@
+import numpy as np
+from .helpers import popcount
+from .sbox import SBox
+
+
+def mobius_transform(truth_tables):
+    """
+    In-place binary Mobius transform over the last axis of a 0/1 uint8 array.
+    Turns the truth table of every row into its algebraic normal form.
+    """
+    size = truth_tables.shape[-1]
+    rows = truth_tables.reshape(-1, size)
+    h = 1
+    while h < size:
+        view = rows.reshape(rows.shape[0], -1, 2, h)
+        view[:, :, 1, :] ^= view[:, :, 0, :]
+        h *= 2
+    return truth_tables
+
+
+def anf_table(sbox):
+    """
+    ANF coefficients of every coordinate function of the S-box.
+
+    Returns a uint8 array A with A[j, u] = 1 iff the monomial x^u appears
+    in the ANF of output bit j.
+    """
+    sbox = SBox.coerce(sbox)
+    return mobius_transform(sbox.bits.copy())
+
+
+def component_anf_table(anf, masks=None):
+    """
+    ANF of every component function b.S(x), from the coordinate ANF table.
+
+    The ANF is linear over GF(2), so the ANF of b.S is the XOR of the
+    coordinate ANFs selected by b. Row i of the result belongs to
+    masks[i] (all 2^m masks by default).
+    """
+    m = anf.shape[0]
+    masks = np.arange(1 << m) if masks is None else np.asarray(masks)
+    mask_bits = ((masks[:, None] >> np.arange(m)) & 1).astype(np.int32)
+    return ((mask_bits @ anf.astype(np.int32)) & 1).astype(np.uint8)
+
+
+def anf_degrees(anf):
+    """Algebraic degree of every row of an ANF table (0 for the zero function)."""
+    weights = popcount(np.arange(anf.shape[-1])).astype(np.int64)
+    return np.where(anf == 1, weights, 0).max(axis=-1)
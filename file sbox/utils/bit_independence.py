@@ -1,32 +1,28 @@
 import numpy as np
-from itertools import product
-from .helpers import to_bit_vector, hamming_weight, validate_and_pad_sbox
+from .helpers import popcount
+from .sbox import SBox, pack_bits
+from .analysis import get_analysis
 
 def calculate_bic_sac(sbox):  
     """  
     Calculate the Bit Independence Criterion - Strict Avalanche Criterion (BIC-SAC)  
     """  
-    # Validate and pad S-box
-    sbox = validate_and_pad_sbox(sbox)
-    
-    n = len(sbox)  # Length of S-box (typically 256 for 8-bit S-box)
-    total_bits = len(format(n - 1, 'b'))  # Bit length (8 for GF(2^8))  
+    sbox = SBox.coerce(sbox)
+
+    n = sbox.size  # Length of S-box (typically 256 for 8-bit S-box)
+    x = np.arange(n)
+    # Only check pairs of different output bits
+    j1, j2 = np.triu_indices(sbox.m, k=1)
     bic_sac_values = []  
 
     # Loop over each bit input and compare different output bits
-    for i in range(total_bits):  # Input bit to flip  
-        for j1 in range(total_bits):  # First output bit  
-            for j2 in range(j1 + 1, total_bits):  # Only check pairs of different output bits
-                diff_count = 0  
-                for x in range(n):  
-                    flipped_x = x ^ (1 << i)  # Flip the i-th input bit  
-                    bit_j1 = (sbox[x] >> j1) & 1  # j1 bit of original output  
-                    bit_j2 = (sbox[x] >> j2) & 1  # j2 bit of original output  
-                    flipped_bit_j1 = (sbox[flipped_x] >> j1) & 1  # j1 bit of flipped output  
-                    flipped_bit_j2 = (sbox[flipped_x] >> j2) & 1  # j2 bit of flipped output  
-                    # Count the bit differences in both output bits
-                    diff_count += (bit_j1 ^ flipped_bit_j1) ^ (bit_j2 ^ flipped_bit_j2)  
-                bic_sac_values.append(diff_count / n)  # Normalize for bit pair
+    for i in range(sbox.n):  # Input bit to flip  
+        # Derivative of every output bit in direction of the i-th input bit,
+        # packed into uint64 words per output bit
+        derivative = pack_bits(sbox.bits ^ sbox.bits[:, x ^ (1 << i)])
+        # Count the bit differences in both output bits for all pairs at once
+        diff_count = popcount(derivative[j1] ^ derivative[j2]).sum(axis=1, dtype=np.int64)
+        bic_sac_values.extend(diff_count / n)  # Normalize for bit pair
     
     # Return the average of all bit pair differences
     return np.mean(bic_sac_values)
@@ -35,29 +31,18 @@ def calculate_bic_nl(sbox):
     """  
     Calculate the Bit Independence Criterion - Nonlinearity (BIC-NL)  
     """  
-    # Validate and pad S-box
-    sbox = validate_and_pad_sbox(sbox)
-    
-    n = 8  # Input length (for 8-bit S-box)
-    m = 8  # Output length (for 8-bit S-box)
-    min_distance = float("inf")  # Start with a large value
+    analysis = get_analysis(sbox)
+    size = analysis.sbox.size
+    m = analysis.sbox.m  # Output length (8 for 8-bit S-box)
 
-    # Convert S-box to boolean function table
-    truth_table = np.array([to_bit_vector(sbox[x]) for x in range(256)])
-
-    # Create all affine functions
-    affine_masks = list(product([0, 1], repeat=n))  # Generate all possible affine masks (for each input bit)
-    
-    # Loop over all affine functions
-    for mask in affine_masks:  
-        mask = np.array(mask)  # Convert mask to numpy array
-        for const in [0, 1]:  # For both possible constant values (0 or 1)
-            # Generate affine function output for each input
-            affine_output = np.array([hamming_weight(mask & to_bit_vector(x)) % 2 ^ const for x in range(256)])
-            # Calculate the Hamming distance for all output bits
-            for bit in range(m):  # For each output bit
-                f_bit = truth_table[:, bit]  # Get the bit for that output
-                distance = 256 - np.sum(f_bit == affine_output)  # Calculate Hamming distance
-                min_distance = min(min_distance, distance)  # Keep track of the minimum distance
+    # Distance of output bit j to the affine function a.x (+ const) is
+    # 2^(n-1) - |W_j(a)| / 2, so the closest affine function over all masks
+    # and both constants is given by the largest Walsh coefficient
+    coordinates = [1 << bit for bit in range(m)]
+    max_bias = max(
+        int(np.max(np.abs(rows)))
+        for _, rows in analysis.walsh_rows(coordinates)
+    )
 
+    min_distance = size // 2 - max_bias // 2
     return min_distance
\ No newline at end of file
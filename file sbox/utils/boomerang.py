@@ -0,0 +1,63 @@
+import numpy as np
+from .helpers import CHUNK_ENTRIES
+from .sbox import SBox
+
+
+def _inverse_values(sbox):
+    if not sbox.is_bijective():
+        raise ValueError("BCT hanya terdefinisi untuk S-box bijektif.")
+    return np.argsort(sbox.values).astype(np.int64)
+
+
+def boomerang_rows(sbox, deltas, chunk_entries=None):
+    """
+    Rows BCT[deltas] of the Boomerang Connectivity Table,
+    BCT[a, b] = #{x : S^-1(S(x) xor b) xor S^-1(S(x xor a) xor b) = a}.
+
+    With T[x, b] = S^-1(S(x) xor b) the condition is T[x, b] xor T[x xor a, b] = a,
+    so a block of rows is a gather of T by x xor a followed by a count.
+    Blocks of output differences b keep every temporary below `chunk_entries`.
+    """
+    sbox = SBox.coerce(sbox)
+    inverse = _inverse_values(sbox)
+    values = sbox.values.astype(np.int64)
+    size = sbox.size
+    deltas = np.asarray(deltas)
+    x = np.arange(size)
+
+    chunk_entries = chunk_entries or CHUNK_ENTRIES
+    b_chunk = max(1, min(size, chunk_entries // (size * max(1, len(deltas)))))
+    table = np.zeros((len(deltas), size), dtype=np.int64)
+    for start in range(0, size, b_chunk):
+        b = np.arange(start, min(start + b_chunk, size))
+        # T[x, b] untuk blok b ini
+        connect = inverse[values[:, None] ^ b[None, :]]
+        # (deltas, x, b): T[x, b] xor T[x xor a, b] == a
+        matches = (connect[None, :, :] ^ connect[x[None, :] ^ deltas[:, None]]) == deltas[:, None, None]
+        table[:, start:start + len(b)] = matches.sum(axis=1)
+    return table
+
+
+def iter_boomerang_table(sbox, deltas=None, chunk_entries=None):
+    """Yield (deltas, BCT[deltas]) blocks with bounded memory."""
+    sbox = SBox.coerce(sbox)
+    if deltas is None:
+        deltas = np.arange(sbox.size)
+    deltas = np.asarray(deltas)
+    chunk_entries = chunk_entries or CHUNK_ENTRIES
+    # Minimal satu baris penuh (x, b) per blok
+    chunk_rows = max(1, chunk_entries // (sbox.size * sbox.size))
+    for start in range(0, len(deltas), chunk_rows):
+        chunk = deltas[start:start + chunk_rows]
+        yield chunk, boomerang_rows(sbox, chunk, chunk_entries)
+
+
+def boomerang_connectivity_table(sbox):
+    """
+    Boomerang Connectivity Table (BCT) of a bijective S-box.
+
+    BCT[a, b] = #{x : S^-1(S(x) xor b) xor S^-1(S(x xor a) xor b) = a}
+    for input difference a and output difference b.
+    """
+    sbox = SBox.coerce(sbox)
+    return np.concatenate([rows for _, rows in iter_boomerang_table(sbox)])
@@ -0,0 +1,17 @@
+import numpy as np
+from .analysis import get_analysis
+
+def compute_boomerang_uniformity(sbox):
+    """
+    Compute the boomerang uniformity of a bijective S-Box:
+    the largest BCT entry over a != 0 and b != 0
+    """
+    analysis = get_analysis(sbox)
+
+    # Row a = 0 and column b = 0 are trivially 2^n
+    boomerang_uniformity = max(
+        int(rows[:, 1:].max())
+        for _, rows in analysis.bct_rows(np.arange(1, analysis.sbox.size))
+    )
+
+    return boomerang_uniformity
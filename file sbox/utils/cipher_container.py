@@ -0,0 +1,255 @@
+"""
+Container biner untuk cipher-image.
+
+Layout (little-endian):
+    magic       4 byte   b"SBXC"
+    version     u8
+    mode        u8       0 = ECB, 1 = CTR
+    pad_len     u8       byte padding di akhir ciphertext (ECB)
+    ndim        u8
+    dtype       u8 panjang + ASCII (mis. "|u1")
+    color_mode  u8 panjang + ASCII (mode PIL, boleh kosong)
+    iv          u8 panjang + byte IV/nonce (boleh kosong)
+    shape       ndim x u64
+    length      u64      panjang ciphertext dalam byte
+    (nol sampai kelipatan 16 byte)
+    ciphertext  `length` byte
+
+Ciphertext disimpan utuh termasuk blok terakhir yang dipadding, sehingga
+dekripsi selalu mengembalikan image yang persis sama.
+"""
+import io
+import math
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .aes_core import AESEngine, BLOCK_SIZE
+from .aes_stream import DEFAULT_CHUNK_SIZE, iter_chunks, ctr_transform
+
+MAGIC = b"SBXC"
+VERSION = 1
+MODES = {"ECB": 0, "CTR": 1}
+MODE_NAMES = {v: k for k, v in MODES.items()}
+
+
+def _pack_str(value):
+    data = value.encode("ascii")
+    return struct.pack("<B", len(data)) + data
+
+
+def pack_header(shape, dtype, mode, iv=b"", pad_len=0, color_mode=""):
+    """Serialize a container header, padded to a multiple of 16 bytes."""
+    dtype = np.dtype(dtype)
+    length = int(np.prod(shape)) * dtype.itemsize + pad_len
+    header = MAGIC + struct.pack("<BBBB", VERSION, MODES[mode], pad_len, len(shape))
+    header += _pack_str(dtype.str) + _pack_str(color_mode)
+    header += struct.pack("<B", len(iv)) + bytes(iv)
+    header += struct.pack(f"<{len(shape)}QQ", *shape, length)
+    return header + b"\0" * (-len(header) % BLOCK_SIZE)
+
+
+def _unpack_from(fmt, view, pos):
+    # struct.error untuk buffer yang terpotong -> ValueError
+    if pos + struct.calcsize(fmt) > len(view):
+        raise ValueError("Header cipher-image terpotong.")
+    return struct.unpack_from(fmt, view, pos)
+
+
+def unpack_header(buffer):
+    """
+    Parse and validate the header at the start of `buffer`.
+
+    Returns:
+        dict: shape, dtype, mode, iv, pad_len, color_mode, length, offset
+              (offset = position of the ciphertext in the buffer)
+
+    Raises:
+        ValueError: if the buffer is not a valid container header
+    """
+    view = memoryview(buffer).cast("B")
+    if bytes(view[:4]) != MAGIC:
+        raise ValueError("Bukan file cipher-image (magic tidak cocok).")
+    version, mode, pad_len, ndim = _unpack_from("<BBBB", view, 4)
+    if version != VERSION:
+        raise ValueError(f"Versi container tidak didukung: {version}")
+    if mode not in MODE_NAMES:
+        raise ValueError(f"Mode container tidak dikenal: {mode}")
+    pos = 8
+
+    fields = []
+    for _ in range(3):
+        (size,) = _unpack_from("<B", view, pos)
+        if pos + 1 + size > len(view):
+            raise ValueError("Header cipher-image terpotong.")
+        fields.append(bytes(view[pos + 1:pos + 1 + size]))
+        pos += 1 + size
+    dtype, color_mode, iv = fields
+
+    try:
+        dtype = np.dtype(dtype.decode("ascii"))
+        color_mode = color_mode.decode("ascii")
+    except (TypeError, ValueError):
+        raise ValueError("Dtype atau color mode container tidak valid.") from None
+    if dtype.hasobject:
+        raise ValueError(f"Dtype container tidak didukung: {dtype}")
+
+    *shape, length = _unpack_from(f"<{ndim}QQ", view, pos)
+    pos += 8 * (ndim + 1)
+    pos += -pos % BLOCK_SIZE
+
+    # Panjang ciphertext harus cocok dengan shape, dtype dan padding
+    nbytes = math.prod(shape) * dtype.itemsize
+    if MODE_NAMES[mode] == "CTR":
+        valid = pad_len == 0 and length == nbytes
+    else:
+        valid = pad_len < BLOCK_SIZE and length == nbytes + pad_len and length % BLOCK_SIZE == 0
+    if not valid:
+        raise ValueError("Panjang ciphertext tidak cocok dengan shape container.")
+
+    return {
+        "shape": tuple(shape),
+        "dtype": dtype,
+        "mode": MODE_NAMES[mode],
+        "iv": iv,
+        "pad_len": pad_len,
+        "color_mode": color_mode,
+        "length": length,
+        "offset": pos,
+    }
+
+
+def _ecb_chunks(engine, chunks, decrypt):
+    transform = engine.decrypt_blocks if decrypt else engine.encrypt_blocks
+    for chunk in chunks:
+        yield transform(chunk.reshape(-1, BLOCK_SIZE)).reshape(-1)
+
+
+def write_cipher_image(dst, img_array, key, sbox, mode="ECB", iv=None, color_mode="",
+                       chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    Encrypt `img_array` (may be an np.memmap) straight into the file-like
+    `dst` as a container. ECB pads the final block with zeros and records
+    the padding length, CTR needs no padding and uses an 8-byte nonce
+    (random when iv is None).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode tidak didukung: {mode}")
+    if chunk_size % BLOCK_SIZE:
+        raise ValueError("chunk_size harus kelipatan 16 byte.")
+    data = np.ascontiguousarray(img_array)
+    nbytes = data.nbytes
+
+    if mode == "CTR":
+        iv = os.urandom(8) if iv is None else bytes(iv)
+        pad_len = 0
+    else:
+        iv = b""
+        pad_len = -nbytes % BLOCK_SIZE
+
+    dst.write(pack_header(data.shape, data.dtype, mode, iv, pad_len, color_mode))
+
+    if mode == "CTR":
+        outputs = ctr_transform(iter_chunks(data, chunk_size), key, sbox, iv, workers)
+    else:
+        engine = AESEngine(key, sbox)
+        flat = np.frombuffer(memoryview(data).cast("B"), dtype=np.uint8)
+        full = nbytes - nbytes % BLOCK_SIZE
+        outputs = _ecb_chunks(engine, iter_chunks(flat[:full], chunk_size), decrypt=False)
+
+    for out in outputs:
+        dst.write(out.tobytes())
+
+    if mode == "ECB" and pad_len:
+        tail = np.zeros(BLOCK_SIZE, dtype=np.uint8)
+        tail[:BLOCK_SIZE - pad_len] = flat[full:]
+        dst.write(engine.encrypt_blocks(tail).tobytes())
+
+
+def encrypt_image_container(img_array, key, sbox, mode="ECB", iv=None, color_mode=""):
+    """Encrypt an image into container bytes (in memory)."""
+    buffer = io.BytesIO()
+    write_cipher_image(buffer, img_array, key, sbox, mode, iv, color_mode)
+    return buffer.getvalue()
+
+
+def _payload(buffer):
+    header = unpack_header(buffer)
+    if len(buffer) - header["offset"] < header["length"]:
+        raise ValueError("Ciphertext cipher-image terpotong.")
+    payload = np.frombuffer(buffer, dtype=np.uint8, count=header["length"],
+                            offset=header["offset"])
+    return header, payload
+
+
+def open_cipher_image(source):
+    """
+    Open a container without copying the ciphertext.
+
+    `source` is a path (memory-mapped read-only, kept open as long as the
+    returned payload is referenced) or a bytes-like object.
+
+    Returns:
+        tuple: (header dict, ciphertext as a read-only uint8 array view)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _payload(source)
+
+
+def _decrypt_container(buffer, key, sbox, out, chunk_size, workers):
+    header, payload = _payload(buffer)
+    if out is None:
+        out = np.empty(header["shape"], dtype=header["dtype"])
+    elif out.shape != header["shape"] or out.dtype != header["dtype"]:
+        raise ValueError("Output harus mempunyai shape dan dtype image asli.")
+    elif not out.flags.c_contiguous:
+        raise ValueError("Output harus C-contiguous.")
+    flat_out = out.reshape(-1).view(np.uint8)
+    nbytes = flat_out.size
+
+    if header["mode"] == "CTR":
+        outputs = ctr_transform(iter_chunks(payload, chunk_size), key, sbox,
+                                header["iv"], workers)
+    else:
+        outputs = _ecb_chunks(AESEngine(key, sbox), iter_chunks(payload, chunk_size),
+                              decrypt=True)
+
+    offset = 0
+    for chunk in outputs:
+        take = min(len(chunk), nbytes - offset)
+        flat_out[offset:offset + take] = chunk[:take]
+        offset += take
+    return out, header
+
+
+def read_cipher_image(source, key, sbox, out=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                      workers=None):
+    """
+    Decrypt a container (path or bytes) back into the exact original
+    array, streaming the ciphertext from the memory-mapped file. `out`
+    may be a preallocated C-contiguous array or np.memmap of the original
+    shape and dtype.
+
+    Returns:
+        tuple: (image array, header dict)
+
+    Raises:
+        ValueError: if the container is malformed or truncated
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        return _decrypt_container(source, key, sbox, out, chunk_size, workers)
+
+    with open(source, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return _decrypt_container(mapped, key, sbox, out, chunk_size, workers)
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            # View payload masih dipegang traceback; mmap ditutup oleh GC
+            pass
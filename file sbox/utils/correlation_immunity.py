@@ -1,18 +1,11 @@
 import numpy as np
+from .helpers import popcount
+from .analysis import get_analysis
+from .walsh import fwht as _fwht
 
 def fwht(a):
     """Fast Walsh-Hadamard Transform."""
-    h = 1
-    a = np.array(a, dtype=int)
-    while h < len(a):
-        for i in range(0, len(a), h * 2):
-            for j in range(i, i + h):
-                x = a[j]
-                y = a[j + h]
-                a[j] = x + y
-                a[j + h] = x - y
-        h *= 2
-    return a
+    return _fwht(np.array(a, dtype=int))
 
 def compute_correlation_immunity(sbox):
     """
@@ -20,37 +13,22 @@ def compute_correlation_immunity(sbox):
     CI order adalah k terbesar dimana Walsh spectrum bernilai 0 
     untuk semua input dengan Hamming weight antara 1 sampai k.
     """
-    size = len(sbox)
-    n = int(np.log2(size))
-    
-    min_ci = n 
-    # Cek setiap fungsi komponen (kombinasi linear dari bit output)
-    # Loop dari 1 sampai 2^n - 1
-    for b in range(1, size):
-        # Buat fungsi komponen f_b(x) = b dot S(x)
-        # Truth table dalam bentuk polarity (+1 / -1)
-        f = np.zeros(size, dtype=int)
-        for x in range(size):
-            dot_val = bin(sbox[x] & b).count('1') % 2
-            f[x] = (-1) ** dot_val
-        
-        # Hitung Walsh Spectrum
-        walsh_spec = fwht(f)
-        # Cari CI untuk fungsi komponen ini
-        # CI adalah k dimana jika 1 <= wt(w) <= k, maka Walsh(w) = 0
-        current_ci = n
-        for w in range(1, size):
-            if walsh_spec[w] != 0:
-                hw = bin(w).count('1')
-                if hw - 1 < current_ci:
-                    current_ci = hw - 1
-                    # Optimasi: jika current_ci jadi 0, tidak mungkin lebih rendah
-                    if current_ci == 0:
-                        break
-        
-        if current_ci < min_ci:
-            min_ci = current_ci
-            if min_ci == 0:
-                break
-                
+    analysis = get_analysis(sbox)
+    size = analysis.sbox.size
+    n = analysis.sbox.n
+
+    # Hamming weight setiap mask input w (w = 0 tidak dihitung)
+    weights = popcount(np.arange(1, size)).astype(int)
+
+    # Walsh spectrum fungsi komponen f_b(x) = b dot S(x), per blok.
+    # CI fungsi komponen b adalah min(wt(w)) - 1 untuk Walsh(w) != 0,
+    # atau n jika seluruh spectrum (selain w = 0) bernilai 0
+    min_ci = n
+    for _, rows in analysis.walsh_rows(np.arange(1, 1 << analysis.sbox.m)):
+        nonzero = rows[:, 1:] != 0
+        per_component = np.where(nonzero, weights[None, :] - 1, n).min(axis=1)
+        min_ci = min(min_ci, int(per_component.min()))
+        if min_ci == 0:
+            break
+
     return min_ci
@@ -0,0 +1,70 @@
+import numpy as np
+from .helpers import iter_row_chunks
+from .sbox import SBox
+
+
+def difference_rows(sbox, deltas):
+    """
+    Rows DDT[deltas] of the difference distribution table,
+    DDT[a, b] = #{x : S(x) xor S(x xor a) = b}.
+    """
+    sbox = SBox.coerce(sbox)
+    values = sbox.values.astype(np.int64)
+    columns = 1 << sbox.m
+    x = np.arange(sbox.size)
+    deltas = np.asarray(deltas)
+    offsets = np.arange(len(deltas))[:, None] * columns
+
+    # Output difference of every (a, x) pair, offset by row so that a single
+    # bincount builds all rows of the block at once
+    output_diff = values[x[None, :]] ^ values[x[None, :] ^ deltas[:, None]]
+    counts = np.bincount((output_diff + offsets).ravel(), minlength=len(deltas) * columns)
+    return counts.reshape(len(deltas), columns)
+
+
+def difference_distribution_table(sbox):
+    """
+    Difference Distribution Table (DDT) of the S-box.
+
+    DDT[a, b] = #{x : S(x) xor S(x xor a) = b} for input difference a
+    and output difference b.
+    """
+    sbox = SBox.coerce(sbox)
+    return difference_rows(sbox, np.arange(sbox.size))
+
+
+def iter_difference_table(sbox, deltas=None, chunk_rows=None):
+    """
+    Yield (deltas, DDT[deltas]) blocks with bounded memory, for S-boxes
+    whose full 2^n x 2^m table does not fit.
+    """
+    sbox = SBox.coerce(sbox)
+    if deltas is None:
+        deltas = np.arange(sbox.size)
+    row_size = max(sbox.size, 1 << sbox.m)
+    for chunk in iter_row_chunks(np.asarray(deltas), row_size, chunk_rows):
+        yield chunk, difference_rows(sbox, chunk)
+
+
+def differential_spectrum(ddt):
+    """
+    Differential spectrum of a DDT: how often each count occurs
+    over all non-trivial input differences (a != 0).
+
+    Returns:
+        dict: {count: number of (a, b) entries with that count}
+    """
+    values, occurrences = np.unique(ddt[1:], return_counts=True)
+    return {int(v): int(c) for v, c in zip(values, occurrences)}
+
+
+def max_differential(ddt):
+    """
+    Largest DDT entry for a != 0 and the number of entries reaching it.
+
+    Returns:
+        tuple: (max_count, number_of_max_entries)
+    """
+    nontrivial = ddt[1:]
+    max_count = int(nontrivial.max())
+    return max_count, int(np.count_nonzero(nontrivial == max_count))
@@ -0,0 +1,18 @@
+import numpy as np
+from .analysis import get_analysis
+
+def compute_differential_linear_uniformity(sbox):
+    """
+    Compute the differential-linear uniformity of the S-Box:
+    the largest |DLCT[a, l]| over a != 0 and l != 0
+    """
+    analysis = get_analysis(sbox)
+
+    # DLCT[a, l] = AC[l, a] / 2, so the rows of the autocorrelation table
+    # per output mask l are the columns of the DLCT
+    max_autocorrelation = max(
+        int(np.max(np.abs(rows[:, 1:])))
+        for _, rows in analysis.autocorrelation_rows(np.arange(1, 1 << analysis.sbox.m))
+    )
+
+    return max_autocorrelation // 2
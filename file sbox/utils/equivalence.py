@@ -0,0 +1,225 @@
+"""
+Invariant ekuivalensi affine dan index S-box yang persisten.
+
+Dua S-box affine-equivalent (S' = A o S o B, dengan A dan B permutasi
+affine) mempunyai invariant yang sama:
+
+- spektrum DDT: multiset baris DDT, tiap baris sebagai multiset nilai
+  (B dan A hanya mempermutasikan baris dan kolom DDT)
+- spektrum |LAT|: multiset baris |W|, tiap baris sebagai multiset nilai
+  (konstanta affine hanya mengubah tanda)
+- distribusi derajat aljabar fungsi komponen
+
+Invariant ini di-hash menjadi satu key. S-box dengan key berbeda pasti
+tidak ekuivalen; key yang sama berarti kandidat ekuivalen (invariant
+perlu, tidak cukup). Struktur siklus permutasi ikut disimpan sebagai info
+tambahan, tetapi tidak masuk key karena hanya invariant terhadap konjugasi
+(B = A^-1), bukan terhadap ekuivalensi affine umum.
+"""
+import hashlib
+import json
+import pathlib
+import sqlite3
+
+import numpy as np
+
+from .algebraic_degree import algebraic_degree_profile
+from .analysis import get_analysis
+from .sbox import SBox
+
+
+def _row_multiset_digest(blocks):
+    # Hash setiap baris yang sudah diurutkan, lalu hash multiset hash baris
+    row_digests = []
+    for rows in blocks:
+        for row in np.sort(rows, axis=1):
+            row_digests.append(hashlib.blake2b(row.astype("<i8").tobytes(), digest_size=16).digest())
+    row_digests.sort()
+    return hashlib.sha256(b"".join(row_digests)).hexdigest()
+
+
+def _value_spectrum(blocks):
+    counts = {}
+    for rows in blocks:
+        values, occurrences = np.unique(rows, return_counts=True)
+        for v, c in zip(values.tolist(), occurrences.tolist()):
+            counts[v] = counts.get(v, 0) + c
+    return {str(v): counts[v] for v in sorted(counts)}
+
+
+def cycle_type(sbox):
+    """
+    Cycle structure of a bijective S-box as {length: number of cycles},
+    or None when the S-box is not a permutation.
+    """
+    sbox = SBox.coerce(sbox)
+    if sbox.n != sbox.m or not sbox.is_bijective():
+        return None
+    values = sbox.values.tolist()
+    seen = bytearray(sbox.size)
+    lengths = {}
+    for start in range(sbox.size):
+        length = 0
+        x = start
+        while not seen[x]:
+            seen[x] = 1
+            x = values[x]
+            length += 1
+        if length:
+            lengths[length] = lengths.get(length, 0) + 1
+    return {str(length): lengths[length] for length in sorted(lengths)}
+
+
+def equivalence_invariants(sbox):
+    """
+    Affine-equivalence invariants of the S-box, computed from the cached
+    DDT and Walsh tables of utils.analysis.
+
+    Returns:
+        dict: n, m, ddt_rows / lat_rows (digests of the row multisets),
+              ddt_spectrum / lat_spectrum ({value: count} over a, b != 0),
+              degree_distribution ({degree: number of components})
+    """
+    analysis = get_analysis(sbox)
+    sbox = analysis.sbox
+    nonzero = np.arange(1, sbox.size)
+    masks = np.arange(1, 1 << sbox.m)
+
+    ddt_rows = lambda: (rows[:, 1:] for _, rows in analysis.ddt_rows(nonzero))
+    # |LAT| = |W| / 2, baris per mask output b
+    lat_rows = lambda: (np.abs(rows[:, 1:]) // 2 for _, rows in analysis.walsh_rows(masks))
+
+    return {
+        "n": sbox.n,
+        "m": sbox.m,
+        "ddt_rows": _row_multiset_digest(ddt_rows()),
+        "lat_rows": _row_multiset_digest(lat_rows()),
+        "ddt_spectrum": _value_spectrum(ddt_rows()),
+        "lat_spectrum": _value_spectrum(lat_rows()),
+        "degree_distribution": {
+            str(d): c for d, c in algebraic_degree_profile(sbox)["distribution"].items()
+        },
+    }
+
+
+def invariant_key(sbox=None, invariants=None):
+    """Hex key of the equivalence invariants; equal for affine-equivalent S-boxes."""
+    if invariants is None:
+        invariants = equivalence_invariants(sbox)
+    text = json.dumps(invariants, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class EquivalenceIndex:
+    """
+    Persistent invariant key -> S-box lookup in an SQLite file.
+
+    Every stored S-box keeps its invariant key (indexed), id, values,
+    cycle type and optional scores, so a new candidate whose key is
+    already present can be skipped and its scores taken from the stored
+    representative. Inserts are committed by commit() or on close.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sboxes (
+            digest TEXT PRIMARY KEY,
+            key TEXT NOT NULL,
+            sbox_id TEXT,
+            n INTEGER NOT NULL,
+            m INTEGER NOT NULL,
+            sbox_values BLOB NOT NULL,
+            cycle_type TEXT,
+            invariants TEXT NOT NULL,
+            scores TEXT
+        );
+        CREATE INDEX IF NOT EXISTS sboxes_key ON sboxes (key);
+    """
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        if readonly:
+            # Path di-escape agar "#" atau "?" di nama file tidak dibaca sebagai bagian URI
+            uri = pathlib.Path(path).absolute().as_uri() + "?mode=ro"
+            self._db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            # WAL: worker read-only tetap bisa membaca selama proses utama menulis
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(self.SCHEMA)
+            self._db.commit()
+
+    def add(self, sbox, sbox_id=None, scores=None, key=None, invariants=None):
+        """
+        Store the S-box under its invariant key. `key` and `invariants` may
+        be passed when already computed, e.g. by a worker process.
+
+        Returns:
+            bool: True if no S-box with the same key was stored before
+        """
+        sbox = SBox.coerce(sbox)
+        if invariants is None:
+            invariants = equivalence_invariants(sbox)
+        key = key or invariant_key(invariants=invariants)
+        new_class = not self.contains_key(key)
+        cycles = cycle_type(sbox)
+        self._db.execute(
+            "INSERT OR IGNORE INTO sboxes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                sbox.digest, key, sbox_id, sbox.n, sbox.m,
+                sbox.values.astype("<u4").tobytes(),
+                json.dumps(cycles) if cycles is not None else None,
+                json.dumps(invariants, sort_keys=True),
+                json.dumps(scores) if scores is not None else None,
+            ),
+        )
+        return new_class
+
+    def contains_key(self, key):
+        row = self._db.execute("SELECT 1 FROM sboxes WHERE key = ? LIMIT 1", (key,)).fetchone()
+        return row is not None
+
+    def find(self, sbox=None, key=None):
+        """
+        Stored S-boxes with the same invariant key as `sbox` (or `key`).
+
+        Returns:
+            list: dicts with id, digest, values, cycle_type and scores
+        """
+        key = key or invariant_key(sbox)
+        rows = self._db.execute(
+            "SELECT sbox_id, digest, sbox_values, cycle_type, scores FROM sboxes WHERE key = ?",
+            (key,),
+        ).fetchall()
+        return [
+            {
+                "id": sbox_id,
+                "digest": digest,
+                "values": np.frombuffer(values, dtype="<u4").tolist(),
+                "cycle_type": json.loads(cycles) if cycles else None,
+                "scores": json.loads(scores) if scores else None,
+            }
+            for sbox_id, digest, values, cycles, scores in rows
+        ]
+
+    def __contains__(self, sbox):
+        return self.contains_key(invariant_key(sbox))
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM sboxes").fetchone()[0]
+
+    def class_count(self):
+        """Number of distinct invariant keys."""
+        return self._db.execute("SELECT COUNT(DISTINCT key) FROM sboxes").fetchone()[0]
+
+    def commit(self):
+        self._db.commit()
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
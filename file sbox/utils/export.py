@@ -0,0 +1,252 @@
+"""
+Export tabel S-box dan laporan batch secara streaming.
+
+Tabel (DDT, LAT, BCT, DLCT, autokorelasi, Walsh) ditulis blok demi blok
+dari baris yang dihasilkan utils.analysis, sehingga memori tetap datar
+berapa pun ukuran tabelnya:
+
+- CSV: satu tabel per file, baris per baris
+- XLSX: openpyxl mode write-only, satu sheet per tabel
+- NPZ: setiap tabel satu entri .npy terkompresi di dalam zip, ditulis
+  per blok (np.load tetap bisa membacanya)
+
+Laporan batch (hasil batch.py dalam CSV/JSONL) juga dialirkan ke XLSX,
+lengkap dengan sheet ringkasan per metrik.
+"""
+import csv
+import io
+import json
+import math
+import os
+import zipfile
+
+import numpy as np
+
+from .analysis import get_analysis
+from .helpers import iter_row_chunks
+
+# Nama tabel -> (judul sheet, label baris, label kolom, nama metode *_rows)
+TABLES = {
+    "ddt": ("DDT", "a", "b", "ddt_rows"),
+    "lat": ("LAT", "a", "b", "lat_rows"),
+    "bct": ("BCT", "a", "b", "bct_rows"),
+    "dlct": ("DLCT", "a", "l", "dlct_rows"),
+    "autocorrelation": ("Autocorrelation", "b", "a", "autocorrelation_rows"),
+    "walsh": ("Walsh", "b", "a", "walsh_rows"),
+}
+
+# Batas kolom lembar Excel
+XLSX_MAX_COLUMNS = 16384
+
+# Elemen tabel per blok yang diminta dari utils.analysis saat export
+EXPORT_CHUNK_ENTRIES = 1 << 18
+
+FORMATS = (".csv", ".xlsx", ".npz")
+
+
+def _check_tables(names):
+    unknown = [name for name in names if name not in TABLES]
+    if unknown:
+        raise ValueError(f"Tabel tidak dikenal: {', '.join(unknown)}")
+
+
+def table_shape(sbox, name):
+    """(rows, columns) of table `name` for the S-box."""
+    _check_tables([name])
+    analysis = get_analysis(sbox)
+    inputs, outputs = analysis.sbox.size, 1 << analysis.sbox.m
+    if name in ("walsh", "autocorrelation"):
+        return outputs, inputs
+    return inputs, outputs
+
+
+def iter_table_rows(sbox, name):
+    """Yield (row indices, row block) of table `name`, one block at a time."""
+    _check_tables([name])
+    analysis = get_analysis(sbox)
+    row_count, columns = table_shape(analysis.sbox, name)
+    rows = getattr(analysis, TABLES[name][3])
+    for chunk in iter_row_chunks(np.arange(row_count), columns,
+                                 max(1, EXPORT_CHUNK_ENTRIES // columns)):
+        yield from rows(chunk)
+
+
+def _text_stream(dst):
+    # Path atau file biner -> file teks untuk csv.writer
+    if isinstance(dst, (str, os.PathLike)):
+        return open(dst, "w", newline="")
+    return io.TextIOWrapper(dst, newline="", write_through=True)
+
+
+def write_table_csv(dst, sbox, name):
+    """Write table `name` as CSV with a header row of column indices."""
+    _check_tables([name])
+    _, row_label, column_label, _ = TABLES[name]
+    columns = table_shape(sbox, name)[1]
+    f = _text_stream(dst)
+    try:
+        writer = csv.writer(f)
+        writer.writerow([f"{row_label}\\{column_label}", *range(columns)])
+        for indices, block in iter_table_rows(sbox, name):
+            for index, row in zip(indices.tolist(), block.tolist()):
+                writer.writerow([index, *row])
+    finally:
+        if isinstance(dst, (str, os.PathLike)):
+            f.close()
+        else:
+            f.detach()
+
+
+def write_tables_xlsx(dst, sbox, names):
+    """Write every table of `names` to its own sheet of a write-only workbook."""
+    from openpyxl import Workbook
+
+    _check_tables(names)
+    for name in names:
+        if table_shape(sbox, name)[1] + 1 > XLSX_MAX_COLUMNS:
+            raise ValueError(f"Tabel {name} terlalu lebar untuk Excel, gunakan CSV atau NPZ")
+
+    workbook = Workbook(write_only=True)
+    for name in names:
+        title, row_label, column_label, _ = TABLES[name]
+        sheet = workbook.create_sheet(title)
+        sheet.append([f"{row_label}\\{column_label}", *range(table_shape(sbox, name)[1])])
+        for indices, block in iter_table_rows(sbox, name):
+            for index, row in zip(indices.tolist(), block.tolist()):
+                sheet.append([index, *row])
+    workbook.save(dst)
+
+
+def write_tables_npz(dst, sbox, names):
+    """
+    Write the tables of `names` into a compressed .npz, streaming every
+    table block by block into its .npy entry.
+    """
+    _check_tables(names)
+    with zipfile.ZipFile(dst, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for name in names:
+            shape = table_shape(sbox, name)
+            header = None
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as entry:
+                for _, block in iter_table_rows(sbox, name):
+                    block = np.ascontiguousarray(block, dtype=np.int64)
+                    if header is None:
+                        header = {"descr": np.lib.format.dtype_to_descr(block.dtype),
+                                  "fortran_order": False, "shape": shape}
+                        np.lib.format.write_array_header_2_0(entry, header)
+                    entry.write(block.tobytes())
+
+
+def write_tables(dst, sbox, names, fmt=None):
+    """
+    Write tables in the format given by `fmt` (".csv", ".xlsx", ".npz")
+    or by the extension of the path `dst`. CSV holds a single table.
+    """
+    fmt = fmt or os.path.splitext(os.fspath(dst))[1].lower()
+    names = list(names)
+    if fmt == ".csv":
+        if len(names) != 1:
+            raise ValueError("CSV hanya dapat berisi satu tabel")
+        write_table_csv(dst, sbox, names[0])
+    elif fmt == ".xlsx":
+        write_tables_xlsx(dst, sbox, names)
+    elif fmt == ".npz":
+        write_tables_npz(dst, sbox, names)
+    else:
+        raise ValueError(f"Format export tidak didukung: {fmt}")
+
+
+def write_sbox(dst, sbox, fmt=".xlsx"):
+    """Write the S-box values as one column without header (like the upload format)."""
+    values = get_analysis(sbox).sbox.values.tolist()
+    if fmt == ".csv":
+        f = _text_stream(dst)
+        try:
+            csv.writer(f).writerows([v] for v in values)
+        finally:
+            if isinstance(dst, (str, os.PathLike)):
+                f.close()
+            else:
+                f.detach()
+        return
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("S-box")
+    for value in values:
+        sheet.append([value])
+    workbook.save(dst)
+
+
+# LAPORAN BATCH
+
+def _iter_results(path):
+    if path.lower().endswith(".jsonl"):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, newline="") as f:
+            yield from csv.DictReader(f)
+
+
+def _result_columns(path):
+    # Kolom = gabungan key semua baris (baris error hanya berisi index/id/error),
+    # dengan "error" di akhir seperti header CSV batch.py
+    if path.lower().endswith(".jsonl"):
+        columns = {}
+        for record in _iter_results(path):
+            columns.update(dict.fromkeys(record))
+    else:
+        with open(path, newline="") as f:
+            columns = dict.fromkeys(csv.DictReader(f).fieldnames or [])
+    if "error" in columns:
+        del columns["error"]
+        columns["error"] = None
+    return list(columns)
+
+
+def _number(value):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    return int(number) if number.is_integer() and "." not in value else number
+
+
+def write_batch_report(results_path, dst):
+    """
+    Stream the rows of a batch.py result file (.csv or .jsonl) into a
+    write-only workbook: sheet "Results" with every row and sheet
+    "Summary" with count, min, max, mean and std per metric, accumulated
+    while streaming.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Results")
+    columns = _result_columns(results_path)
+    sheet.append(columns)
+    stats = {}
+    for record in _iter_results(results_path):
+        row = [_number(record.get(column)) for column in columns]
+        sheet.append(row)
+        # Baris dengan error tetap menyumbang metrik yang berhasil dihitung
+        for column, value in zip(columns, row):
+            if column in ("index", "id", "error") or not isinstance(value, (int, float)):
+                continue
+            count, total, squares, low, high = stats.get(column, (0, 0.0, 0.0, value, value))
+            stats[column] = (count + 1, total + value, squares + value * value,
+                             min(low, value), max(high, value))
+
+    summary = workbook.create_sheet("Summary")
+    summary.append(["metric", "count", "min", "max", "mean", "std"])
+    for column, (count, total, squares, low, high) in stats.items():
+        mean = total / count
+        summary.append([column, count, low, high, mean,
+                        math.sqrt(max(squares / count - mean * mean, 0.0))])
+    workbook.save(dst)
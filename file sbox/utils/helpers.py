@@ -2,11 +2,11 @@ import numpy as np
 
 def binary_representation(num, width):  
     """Convert number to binary with a fixed width."""  
-    return [int(x) for x in f"{num:0{width}b}"]  
+    return [(num >> shift) & 1 for shift in range(width - 1, -1, -1)]
 
 def to_bit_vector(value, length=8):  
     """Convert a value to a bit vector of specified length"""  
-    return np.array([int(x) for x in f"{value:0{length}b}"])  
+    return (value >> np.arange(length - 1, -1, -1)) & 1
 
 def hamming_weight(vec):  
     """Calculate the Hamming weight of a vector."""  
@@ -23,7 +23,8 @@ def validate_and_pad_sbox(sbox):
         list: Validated and padded/truncated S-box
     """
     # Salin sbox untuk menghindari perubahan langsung pada input
-    sbox = sbox.copy()
+    # (list() juga menerima numpy array dan sequence lain)
+    sbox = list(sbox)
 
     # Pastikan S-box memiliki tepat 256 elemen
     if len(sbox) < 256:
@@ -33,4 +34,32 @@ def validate_and_pad_sbox(sbox):
         # Potong jika lebih dari 256 elemen
         sbox = sbox[:256]
     
-    return sbox
\ No newline at end of file
+    return sbox
+
+# Hamming weight of every byte, used for vectorized parity and popcount
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(values):
+    """Hamming weight of each element of a non-negative integer array."""
+    values = np.asarray(values)
+    result = np.zeros(values.shape, dtype=np.uint8)
+    for shift in range(0, values.dtype.itemsize * 8, 8):
+        result += POPCOUNT_TABLE[(values >> shift) & 0xFF]
+    return result
+
+
+def parity(values):
+    """Parity (popcount mod 2) of each element of a non-negative integer array."""
+    return popcount(values) & 1
+
+
+# Jumlah elemen maksimum per blok saat spektrum besar dihitung bertahap
+CHUNK_ENTRIES = 1 << 22
+
+
+def iter_row_chunks(rows, row_size, chunk_rows=None):
+    """Split an index array into blocks of about CHUNK_ENTRIES elements."""
+    chunk_rows = chunk_rows or max(1, CHUNK_ENTRIES // row_size)
+    for start in range(0, len(rows), chunk_rows):
+        yield rows[start:start + chunk_rows]
@@ -0,0 +1,221 @@
+"""
+Metrik kualitas cipher-image dalam satu pass.
+
+Entropy histogram, chi-square per channel, korelasi piksel bertetangga
+(horizontal, vertikal, diagonal) serta NPCR dan UACI terhadap image kedua
+dihitung sekaligus sambil membaca image per blok baris (tile). Data tetap
+uint8. Tidak ada salinan int64 dari seluruh image, hanya temporer
+seukuran tile, sehingga image sangat besar (np.memmap) pun dapat diproses.
+"""
+import numpy as np
+
+from .helpers import CHUNK_ENTRIES
+
+DIRECTIONS = ("horizontal", "vertical", "diagonal")
+
+
+def _as_3d(image):
+    # Image grayscale (H, W) diperlakukan sebagai satu channel
+    image = image if isinstance(image, np.ndarray) else np.asarray(image)
+    if image.dtype != np.uint8:
+        raise ValueError("Image harus bertipe uint8.")
+    if image.ndim == 2:
+        return image[:, :, None]
+    if image.ndim != 3:
+        raise ValueError("Image harus berdimensi (H, W) atau (H, W, C).")
+    return image
+
+
+def _entropy(hist):
+    total = hist.sum()
+    if not total:
+        return 0.0
+    p = hist[hist > 0] / total
+    return float(-np.sum(p * np.log2(p)))
+
+
+def _moments(block):
+    """[sum, sum of squares] per channel of a small uint8 block (a row or column)."""
+    values = block.reshape(-1, block.shape[-1]).astype(np.int64)
+    return np.stack([values.sum(axis=0), (values * values).sum(axis=0)])
+
+
+def difference_counts(a, b):
+    """
+    Number of differing bytes and sum of |a - b| of two uint8 arrays of the
+    same shape, the counts behind NPCR and UACI.
+    """
+    changed = int(np.count_nonzero(a != b))
+    # |a - b| tanpa konversi ke int: max - min tetap uint8
+    diff = np.maximum(a, b)
+    diff -= np.minimum(a, b)
+    return changed, int(diff.sum(dtype=np.int64))
+
+
+def byte_entropy(data):
+    """Shannon entropy (bits per byte) of bytes or a uint8 array, via bincount."""
+    values = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray)) \
+        else np.asarray(data, dtype=np.uint8).ravel()
+    return _entropy(np.bincount(values, minlength=256))
+
+
+class ImageMetrics:
+    """
+    Running accumulator of cipher-image metrics over consecutive row tiles.
+
+    Call update(tile, other_tile) for the tiles of an (H, W) or (H, W, C)
+    uint8 image in order, then result(). Vertical and diagonal pairs that
+    cross a tile boundary are handled with the last row of the previous tile.
+
+    Only the products sum(x * y) need a pass per direction. The sums of x
+    and x^2 over the pairs follow from the histogram minus the first or
+    last row and column, which are tracked separately.
+    """
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.hist = np.zeros((channels, 256), dtype=np.int64)
+        self.products = {d: np.zeros(channels, dtype=np.int64) for d in DIRECTIONS}
+        # [sum, sum kuadrat] dari kolom pertama dan kolom terakhir per channel
+        self.first_column = np.zeros((2, channels), dtype=np.int64)
+        self.last_column = np.zeros((2, channels), dtype=np.int64)
+        self.height = 0
+        self.width = None
+        self.changed = 0
+        self.abs_diff = 0
+        self.compared = 0
+        self._first_row = None
+        self._last_row = None
+
+    def _add_products(self, direction, x, y):
+        if x.size:
+            # 255 * 255 masih muat di uint16
+            self.products[direction] += np.multiply(x, y, dtype=np.uint16).sum(
+                axis=(0, 1), dtype=np.int64)
+
+    def update(self, tile, other_tile=None):
+        tile = _as_3d(tile)
+        if not len(tile):
+            return
+        for c in range(self.channels):
+            self.hist[c] += np.bincount(tile[:, :, c].ravel(), minlength=256)
+        self.first_column += _moments(tile[:, :1])
+        self.last_column += _moments(tile[:, -1:])
+
+        self._add_products("horizontal", tile[:, :-1], tile[:, 1:])
+        self._add_products("vertical", tile[:-1], tile[1:])
+        self._add_products("diagonal", tile[:-1, :-1], tile[1:, 1:])
+        if self._last_row is None:
+            self._first_row = tile[:1].copy()
+            self.width = tile.shape[1]
+        else:
+            self._add_products("vertical", self._last_row, tile[:1])
+            self._add_products("diagonal", self._last_row[:, :-1], tile[:1, 1:])
+        self._last_row = tile[-1:].copy()
+        self.height += len(tile)
+
+        if other_tile is not None:
+            other_tile = _as_3d(other_tile)
+            if other_tile.shape != tile.shape:
+                raise ValueError("Kedua image harus berukuran sama.")
+            changed, abs_diff = difference_counts(tile, other_tile)
+            self.changed += changed
+            self.abs_diff += abs_diff
+            self.compared += tile.size
+
+    def _pair_moments(self, direction):
+        """Number of pairs and the [sum, sum of squares] of x and of y per channel."""
+        levels = np.arange(256, dtype=np.int64)
+        total = np.stack([self.hist @ levels, self.hist @ (levels * levels)])
+        first_row = _moments(self._first_row)
+        last_row = _moments(self._last_row)
+        # Piksel pojok kiri atas dan kanan bawah
+        first_pixel = _moments(self._first_row[:, :1])
+        last_pixel = _moments(self._last_row[:, -1:])
+
+        if direction == "horizontal":
+            x = total - self.last_column
+            y = total - self.first_column
+            n = self.height * (self.width - 1)
+        elif direction == "vertical":
+            x = total - last_row
+            y = total - first_row
+            n = (self.height - 1) * self.width
+        else:
+            x = total - last_row - self.last_column + last_pixel
+            y = total - first_row - self.first_column + first_pixel
+            n = (self.height - 1) * (self.width - 1)
+        return n, x, y
+
+    def correlation(self, direction):
+        """Pearson correlation of adjacent pixels per channel."""
+        if self._first_row is None:
+            return [0.0] * self.channels
+        n, x, y = self._pair_moments(direction)
+        result = []
+        for c in range(self.channels):
+            # Python int agar n * sum tidak overflow pada image besar
+            sx, sxx, sy, syy = int(x[0, c]), int(x[1, c]), int(y[0, c]), int(y[1, c])
+            sxy = int(self.products[direction][c])
+            cov = n * sxy - sx * sy
+            var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+            result.append(cov / var ** 0.5 if var > 0 else 0.0)
+        return result
+
+    def result(self):
+        """
+        Returns:
+            dict: entropy (all channels), channel_entropy, chi_square per
+                  channel, correlation {direction: per channel} and, when a
+                  second image was given, npcr and uaci in percent
+        """
+        expected = self.hist[0].sum() / 256
+        chi_square = [
+            float(np.sum((hist - expected) ** 2) / expected) if expected else 0.0
+            for hist in self.hist
+        ]
+        metrics = {
+            "entropy": _entropy(self.hist.sum(axis=0)),
+            "channel_entropy": [_entropy(hist) for hist in self.hist],
+            "chi_square": chi_square,
+            "correlation": {d: self.correlation(d) for d in DIRECTIONS},
+        }
+        if self.compared:
+            metrics["npcr"] = self.changed / self.compared * 100
+            metrics["uaci"] = self.abs_diff / (255 * self.compared) * 100
+        return metrics
+
+
+def _tile_rows(image, tile_rows=None):
+    row_bytes = max(1, image.shape[1] * image.shape[2])
+    return tile_rows or max(2, CHUNK_ENTRIES // row_bytes)
+
+
+def iter_tiles(image, tile_rows=None):
+    """Yield consecutive row tiles of about CHUNK_ENTRIES bytes."""
+    image = _as_3d(image)
+    tile_rows = _tile_rows(image, tile_rows)
+    for start in range(0, image.shape[0], tile_rows):
+        yield image[start:start + tile_rows]
+
+
+def image_metrics(image, other=None, tile_rows=None):
+    """
+    Entropy, chi-square, adjacent-pixel correlation and (with `other`,
+    e.g. a cipher-image under a different key) NPCR and UACI of a uint8
+    image in one tiled pass. See ImageMetrics.result for the keys.
+    """
+    image = _as_3d(image)
+    metrics = ImageMetrics(image.shape[2])
+    if other is None:
+        for tile in iter_tiles(image, tile_rows):
+            metrics.update(tile)
+    else:
+        other = _as_3d(other)
+        if other.shape != image.shape:
+            raise ValueError("Kedua image harus berukuran sama.")
+        tile_rows = _tile_rows(image, tile_rows)
+        for start in range(0, image.shape[0], tile_rows):
+            stop = start + tile_rows
+            metrics.update(image[start:stop], other[start:stop])
+    return metrics.result()
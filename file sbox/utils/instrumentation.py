@@ -0,0 +1,245 @@
+"""
+Instrumentasi pemanggilan metrik dan enkripsi.
+
+Aktif jika variabel lingkungan SBOX_INSTRUMENT diset ("1"), atau lewat
+configure_instrumentation(enabled=True). Setiap pemanggilan fungsi yang
+dibungkus mencatat waktu wall, waktu CPU thread, puncak alokasi
+tracemalloc dan jumlah panggilan (serta error). Dengan
+SBOX_INSTRUMENT=profile, pemanggilan terluar di setiap thread juga
+dijalankan di bawah cProfile dan hasilnya digabung.
+
+Saat tidak aktif, wrapper hanya memeriksa satu flag lalu memanggil
+fungsi aslinya.
+"""
+import cProfile
+import functools
+import io
+import json
+import marshal
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+INSTRUMENT_ENV = "SBOX_INSTRUMENT"
+
+_lock = threading.Lock()
+_local = threading.local()
+_stats = {}
+_state = {"active": 0, "profile": None, "started_tracemalloc": False}
+_config = {"enabled": False, "profile": False}
+
+
+def configure_instrumentation(enabled=None, profile=None):
+    """
+    Switch instrumentation (and cProfile collection) on or off. None keeps
+    the current setting. tracemalloc is started on demand and stopped
+    again when instrumentation is switched off.
+    """
+    with _lock:
+        if profile is not None:
+            _config["profile"] = bool(profile)
+        if enabled is not None:
+            _config["enabled"] = bool(enabled)
+        if _config["enabled"] and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _state["started_tracemalloc"] = True
+        elif not _config["enabled"] and _state["started_tracemalloc"]:
+            tracemalloc.stop()
+            _state["started_tracemalloc"] = False
+
+
+def is_enabled():
+    return _config["enabled"]
+
+
+def profiling_enabled():
+    return _config["enabled"] and _config["profile"]
+
+
+def _new_stats():
+    return {"calls": 0, "errors": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+            "max_wall_seconds": 0.0, "peak_bytes": 0}
+
+
+def _record(name, wall, cpu, peak, failed):
+    with _lock:
+        stats = _stats.setdefault(name, _new_stats())
+        stats["calls"] += 1
+        stats["errors"] += failed
+        stats["wall_seconds"] += wall
+        stats["cpu_seconds"] += cpu
+        stats["max_wall_seconds"] = max(stats["max_wall_seconds"], wall)
+        stats["peak_bytes"] = max(stats["peak_bytes"], peak)
+
+
+def _call(name, func, args, kwargs):
+    depth = getattr(_local, "depth", 0)
+    profiler = cProfile.Profile() if _config["profile"] and depth == 0 else None
+
+    with _lock:
+        # Puncak tracemalloc bersifat global: direset hanya jika tidak ada
+        # pemanggilan lain yang sedang berjalan, sehingga nilai pemanggilan
+        # yang tumpang tindih adalah batas atas
+        if _state["active"] == 0 and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        _state["active"] += 1
+    start_bytes = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    _local.depth = depth + 1
+    failed = True
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    try:
+        if profiler is not None:
+            result = profiler.runcall(func, *args, **kwargs)
+        else:
+            result = func(*args, **kwargs)
+        failed = False
+        return result
+    finally:
+        cpu = time.thread_time() - cpu
+        wall = time.perf_counter() - wall
+        _local.depth = depth
+        peak = tracemalloc.get_traced_memory()[1] - start_bytes if tracemalloc.is_tracing() else 0
+        with _lock:
+            _state["active"] -= 1
+            if profiler is not None:
+                if _state["profile"] is None:
+                    _state["profile"] = pstats.Stats(profiler)
+                else:
+                    _state["profile"].add(profiler)
+        _record(name, wall, cpu, max(peak, 0), failed)
+
+
+def instrumented(name=None):
+    """
+    Decorator recording every call of the function under `name`
+    (default: module.qualname) while instrumentation is enabled.
+    """
+    def decorator(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _config["enabled"]:
+                return func(*args, **kwargs)
+            return _call(label, func, args, kwargs)
+
+        return wrapper
+    return decorator
+
+
+def instrument(func, name=None):
+    """Wrap an existing function, e.g. instrument(compute_nonlinearity, "nl")."""
+    return instrumented(name)(func)
+
+
+# HASIL
+
+def snapshot():
+    """
+    Stats per name: calls, errors, total and max wall seconds, CPU
+    seconds, mean wall seconds and peak traced bytes of a single call.
+    """
+    with _lock:
+        stats = {name: dict(values) for name, values in _stats.items()}
+    for values in stats.values():
+        values["mean_wall_seconds"] = values["wall_seconds"] / values["calls"]
+    return stats
+
+
+def reset():
+    """Clear all collected stats and the merged profile."""
+    with _lock:
+        _stats.clear()
+        _state["profile"] = None
+
+
+def drain():
+    """
+    Return the raw stats and the raw cProfile data and clear both, e.g. to
+    ship them from a worker process to merge() in the parent.
+
+    Returns:
+        tuple: (stats, profile stats dict or None)
+    """
+    with _lock:
+        stats = {name: dict(values) for name, values in _stats.items()}
+        profile = _state["profile"].stats if _state["profile"] is not None else None
+        _stats.clear()
+        _state["profile"] = None
+    return stats, profile
+
+
+def merge(stats, profile=None):
+    """Add the raw stats (and profile data) from drain() of another process."""
+    with _lock:
+        for name, values in stats.items():
+            current = _stats.setdefault(name, _new_stats())
+            for key in ("calls", "errors", "wall_seconds", "cpu_seconds"):
+                current[key] += values[key]
+            for key in ("max_wall_seconds", "peak_bytes"):
+                current[key] = max(current[key], values[key])
+        if profile:
+            other = pstats.Stats()
+            other.stats = profile
+            other.get_top_level_stats()
+            if _state["profile"] is None:
+                _state["profile"] = other
+            else:
+                _state["profile"].add(other)
+
+
+def export_json(dst=None):
+    """
+    Write the snapshot as JSON to the path or file object `dst`.
+
+    Returns:
+        str: the JSON text
+    """
+    text = json.dumps(snapshot(), indent=1, sort_keys=True)
+    if isinstance(dst, (str, os.PathLike)):
+        with open(dst, "w") as f:
+            f.write(text)
+    elif dst is not None:
+        dst.write(text)
+    return text
+
+
+def export_profile(dst=None):
+    """
+    Write the merged cProfile data (pstats format, readable with
+    `python -m pstats` or snakeviz) to the path `dst`.
+
+    Returns:
+        bytes: the dump, or None when no profile was collected
+    """
+    with _lock:
+        profile = _state["profile"]
+        if profile is None:
+            return None
+        data = marshal.dumps(profile.stats)
+    if dst is not None:
+        with open(dst, "wb") as f:
+            f.write(data)
+    return data
+
+
+def profile_text(limit=30, sort="cumulative"):
+    """The merged profile as a pstats text report, or "" without profile."""
+    with _lock:
+        profile = _state["profile"]
+        if profile is None:
+            return ""
+        stream = io.StringIO()
+        report = pstats.Stats(stream=stream)
+        report.add(profile)
+        report.sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+_mode = os.environ.get(INSTRUMENT_ENV, "").strip().lower()
+if _mode and _mode not in ("0", "false", "no", "off"):
+    configure_instrumentation(enabled=True, profile=_mode == "profile")
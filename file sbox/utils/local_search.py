@@ -0,0 +1,149 @@
+import numpy as np
+from .sbox import SBox
+from .walsh import walsh_spectrum
+from .difference_table import difference_distribution_table
+from .helpers import parity
+
+
+def _signs(masks, x):
+    # (-1)^(mask.x) untuk setiap mask
+    return 1 - 2 * parity(masks & x).astype(np.int32)
+
+
+class SearchState:
+    """
+    Mutable S-box with its Walsh spectrum and DDT kept resident, for
+    swap-based local search (hill climbing).
+
+    Nonlinearity and differential uniformity follow compute_nonlinearity
+    and compute_differential_uniformity. After swapping S(i) and S(j) the
+    tables are updated incrementally instead of being recomputed:
+
+    - Walsh: W'[b, a] = W[b, a] + u[b] * v[a] with
+      u[b] = (-1)^(b.S(j)) - (-1)^(b.S(i)) and v[a] = (-1)^(a.i) - (-1)^(a.j),
+      a rank-1 update touching only rows with u[b] != 0.
+    - DDT: for every input difference a only the pairs starting at
+      x in {i, j, i^a, j^a} change, i.e. O(2^n) cells in total.
+
+    score_swap(i, j) evaluates a move without applying it.
+    """
+
+    def __init__(self, sbox):
+        sbox = SBox.coerce(sbox)
+        self.n = sbox.n
+        self.m = sbox.m
+        self.size = sbox.size
+        self.values = sbox.values.astype(np.int64)
+
+        self.walsh = walsh_spectrum(sbox).copy()
+        self.ddt = difference_distribution_table(sbox).astype(np.int64)
+
+        # Semua mask input a dan output b; tanda (-1)^(a.x) dihitung saat dibutuhkan
+        self._inputs = np.arange(self.size)
+        self._outputs = np.arange(1 << self.m)
+        self._coordinates = np.array([1 << bit for bit in range(self.m)])
+
+        # Histogram nilai DDT untuk a != 0, agar DU bisa dibaca tanpa memindai tabel
+        self._ddt_histogram = np.bincount(self.ddt[1:].ravel(), minlength=self.size + 1)
+
+    # METRIK KEADAAN SAAT INI
+
+    def nonlinearity(self):
+        """Nonlinearity as in compute_nonlinearity (coordinate functions, a != 0)."""
+        max_bias = int(np.max(np.abs(self.walsh[self._coordinates, 1:])))
+        return (1 << (self.n - 1)) - max_bias // 2
+
+    def differential_uniformity(self):
+        """Differential uniformity as in compute_differential_uniformity."""
+        return int(np.flatnonzero(self._ddt_histogram)[-1])
+
+    def linear_approximation_probability(self):
+        """LAP as in linear_approximation_probability."""
+        return float(np.max(np.abs(self.walsh[1:, 1:]))) / self.size / 2
+
+    def score(self):
+        """(nonlinearity, differential uniformity) of the current S-box."""
+        return self.nonlinearity(), self.differential_uniformity()
+
+    # PERUBAHAN AKIBAT SWAP
+
+    def _walsh_factors(self, i, j):
+        yi, yj = self.values[i], self.values[j]
+        u = _signs(self._outputs, yj) - _signs(self._outputs, yi)
+        v = _signs(self._inputs, i) - _signs(self._inputs, j)
+        return u, v
+
+    def _ddt_changes(self, i, j):
+        """
+        DDT cells touched by swapping S(i) and S(j).
+
+        Returns:
+            tuple: (flat cell indices, count deltas), one entry per cell
+        """
+        deltas = np.arange(1, self.size)
+        starts = np.stack([
+            np.full_like(deltas, i), np.full_like(deltas, j), i ^ deltas, j ^ deltas,
+        ], axis=1)
+        # Untuk a = i ^ j himpunan {i, j, i^a, j^a} hanya berisi i dan j
+        keep = np.ones_like(starts, dtype=bool)
+        keep[deltas == (i ^ j), 2:] = False
+
+        rows = np.broadcast_to(deltas[:, None], starts.shape)[keep]
+        starts = starts[keep]
+        partners = starts ^ rows
+
+        swapped = self.values.copy()
+        swapped[i], swapped[j] = swapped[j], swapped[i]
+
+        columns = 1 << self.m
+        old_cells = rows * columns + (self.values[starts] ^ self.values[partners])
+        new_cells = rows * columns + (swapped[starts] ^ swapped[partners])
+
+        cells, inverse = np.unique(np.concatenate([old_cells, new_cells]), return_inverse=True)
+        change = np.bincount(inverse, weights=np.repeat([-1, 1], len(old_cells)))
+        change = change.astype(np.int64)
+        nonzero = change != 0
+        return cells[nonzero], change[nonzero]
+
+    def score_swap(self, i, j):
+        """
+        (nonlinearity, differential uniformity) after swapping S(i) and S(j),
+        without modifying the state. Costs O(m * 2^n + 2^n log 2^n).
+        """
+        if i == j:
+            return self.score()
+
+        u, v = self._walsh_factors(i, j)
+        coordinate_rows = self.walsh[self._coordinates, 1:] + np.outer(u[self._coordinates], v[1:])
+        nonlinearity = (1 << (self.n - 1)) - int(np.max(np.abs(coordinate_rows))) // 2
+
+        cells, change = self._ddt_changes(i, j)
+        old = self.ddt.ravel()[cells]
+        histogram = self._ddt_histogram.copy()
+        np.subtract.at(histogram, old, 1)
+        np.add.at(histogram, old + change, 1)
+        uniformity = int(np.flatnonzero(histogram)[-1])
+
+        return nonlinearity, uniformity
+
+    def swap(self, i, j):
+        """Swap S(i) and S(j) and update the Walsh spectrum and DDT in place."""
+        if i == j:
+            return
+
+        u, v = self._walsh_factors(i, j)
+        rows = np.flatnonzero(u)
+        self.walsh[rows] += np.outer(u[rows], v).astype(self.walsh.dtype)
+
+        cells, change = self._ddt_changes(i, j)
+        flat = self.ddt.ravel()
+        old = flat[cells]
+        flat[cells] = old + change
+        np.subtract.at(self._ddt_histogram, old, 1)
+        np.add.at(self._ddt_histogram, old + change, 1)
+
+        self.values[i], self.values[j] = self.values[j], self.values[i]
+
+    def to_sbox(self):
+        """Current S-box as an immutable SBox."""
+        return SBox(self.values, m=self.m)
@@ -0,0 +1,249 @@
+"""
+Registry metrik S-box dan scheduler berbasis DAG.
+
+Setiap metrik mendeklarasikan tabel perantara yang dibutuhkannya (Walsh,
+DDT, ANF, autokorelasi, BCT, confusion coefficient, tabel bit). Untuk
+satu himpunan metrik, scheduler membentuk DAG minimal tabel -> metrik,
+membangun setiap tabel sekali lewat cache utils.analysis, dan menjalankan
+cabang yang saling independen secara bersamaan di executor yang
+diberikan. Modul metrik baru di-import saat metrik tersebut pertama kali
+dijalankan.
+"""
+import importlib
+import threading
+from concurrent.futures import Future
+
+from . import instrumentation
+from .analysis import get_analysis
+from .sbox import SBox
+
+# Tabel -> tabel yang harus dibangun lebih dulu (lihat SboxAnalysis.BUILDERS).
+# "bits" adalah tabel bit koordinat milik SBox, selalu tersedia.
+TABLE_DEPENDENCIES = {
+    "bits": (),
+    "walsh": (),
+    "ddt": (),
+    "anf": (),
+    "bct": (),
+    "lat": ("walsh",),
+    "autocorrelation": ("walsh",),
+    "dlct": ("autocorrelation",),
+    "component_anf": ("anf",),
+    "confusion": (),
+}
+
+
+class Metric:
+    """
+    A registered metric: `module.function` is imported on first call,
+    `key` selects one field when the function returns a dict.
+    """
+
+    def __init__(self, name, label, module, function, tables, fmt="{}", key=None):
+        self.name = name
+        self.label = label
+        self.module = module
+        self.function = function
+        self.tables = tuple(tables)
+        self.fmt = fmt
+        self.key = key
+        self._func = None
+
+    def load(self):
+        if self._func is None:
+            self._func = getattr(importlib.import_module(f".{self.module}", __package__),
+                                 self.function)
+        return self._func
+
+    def __call__(self, sbox):
+        result = self.load()(sbox)
+        return result[self.key] if self.key is not None else result
+
+    def format(self, value):
+        return self.fmt.format(value)
+
+    def __repr__(self):
+        return f"Metric({self.name!r}, tables={self.tables})"
+
+
+METRICS = {
+    metric.name: metric
+    for metric in [
+        Metric("nl", "Nonlinearity", "nonlinearity", "compute_nonlinearity", ["walsh"]),
+        Metric("sac", "SAC", "avalanche_criterion", "strict_avalanche_criterion",
+               ["bits"], "{:.10f}"),
+        Metric("bic_nl", "BIC-NL", "bit_independence", "calculate_bic_nl", ["walsh"]),
+        Metric("bic_sac", "BIC-SAC", "bit_independence", "calculate_bic_sac",
+               ["bits"], "{:.10f}"),
+        Metric("lap", "LAP", "linear_approximation", "linear_approximation_probability",
+               ["walsh"], "{:.6f}"),
+        Metric("dap", "DAP", "differential_approximation", "calculate_dap",
+               ["ddt"], "{:.10f}"),
+        Metric("du", "Differential Uniformity (DU)", "differential_uniformity",
+               "compute_differential_uniformity", ["ddt"]),
+        Metric("ad", "Algebraic Degree (AD)", "algebraic_degree", "compute_algebraic_degree",
+               ["anf"]),
+        Metric("ad_min", "Minimum Component Degree", "algebraic_degree",
+               "algebraic_degree_profile", ["component_anf"], key="min_degree"),
+        Metric("ci", "Correlation Immunity (CI)", "correlation_immunity",
+               "compute_correlation_immunity", ["walsh"]),
+        Metric("to", "Transparency Order (TO)", "transparency_order",
+               "compute_transparency_order", ["autocorrelation"], "{:.6f}"),
+        Metric("bu", "Boomerang Uniformity (BU)", "boomerang_uniformity",
+               "compute_boomerang_uniformity", ["bct"]),
+        Metric("dlu", "Differential-Linear Uniformity (DLU)", "differential_linear",
+               "compute_differential_linear_uniformity", ["autocorrelation"]),
+        Metric("mto", "Modified Transparency Order (MTO)", "side_channel",
+               "compute_modified_transparency_order", ["walsh"], "{:.6f}"),
+        Metric("cc_mean", "Confusion Coefficient (mean)", "side_channel",
+               "confusion_coefficient_stats", ["confusion"], "{:.6f}", key="mean"),
+        Metric("cc_var", "Confusion Coefficient (variance)", "side_channel",
+               "confusion_coefficient_stats", ["confusion"], "{:.6f}", key="variance"),
+    ]
+}
+
+
+def _check_names(names):
+    unknown = [name for name in names if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Metrik tidak dikenal: {', '.join(unknown)}")
+
+
+def required_tables(names):
+    """
+    Tables needed by the metrics `names`, dependencies first.
+
+    Returns:
+        list: table names in topological order
+    """
+    _check_names(names)
+    order = []
+
+    def visit(table):
+        if table in order:
+            return
+        for dependency in TABLE_DEPENDENCIES[table]:
+            visit(dependency)
+        order.append(table)
+
+    for name in names:
+        for table in METRICS[name].tables:
+            visit(table)
+    return order
+
+
+def metric_graph(names):
+    """
+    The minimal DAG for the metrics `names` as {node: dependencies}, with
+    table nodes named "table:<name>" and metric nodes by metric name.
+    """
+    graph = {
+        f"table:{table}": [f"table:{dep}" for dep in TABLE_DEPENDENCIES[table]]
+        for table in required_tables(names)
+    }
+    for name in dict.fromkeys(names):
+        graph[name] = [f"table:{table}" for table in METRICS[name].tables]
+    return graph
+
+
+# SCHEDULER
+
+class _InlineExecutor:
+    """Runs every task immediately in the calling thread."""
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def _build_table(analysis, table):
+    # Tabel besar tidak dibangun penuh: metrik menghitung barisnya sendiri
+    if table != "bits" and analysis.fits():
+        analysis.table(table)
+
+
+def schedule(sbox, names, executor=None):
+    """
+    Submit the DAG of the metrics `names` to `executor` (inline when None).
+    A node is submitted as soon as all of its dependencies finished, so
+    independent tables and metrics run concurrently on a thread pool.
+    A failing table fails the metrics depending on it.
+
+    Returns:
+        dict: metric name -> Future of its value
+    """
+    sbox = SBox.coerce(sbox)
+    graph = metric_graph(names)
+    executor = executor or _InlineExecutor()
+    analysis = get_analysis(sbox)
+
+    tasks = {}
+    for node in graph:
+        if node.startswith("table:"):
+            table = node[len("table:"):]
+            tasks[node] = instrumentation.instrument(
+                lambda table=table: _build_table(analysis, table), f"table.{table}")
+        else:
+            metric = METRICS[node]
+            tasks[node] = instrumentation.instrument(
+                lambda metric=metric: metric(sbox), f"metric.{node}")
+
+    futures = {node: Future() for node in graph}
+    remaining = {node: len(deps) for node, deps in graph.items()}
+    dependents = {node: [] for node in graph}
+    for node, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(node)
+    lock = threading.Lock()
+
+    def finish(node, error, value=None):
+        with lock:
+            if futures[node].done():
+                return
+            if error is not None:
+                futures[node].set_exception(error)
+            else:
+                futures[node].set_result(value)
+        ready = []
+        for dependent in dependents[node]:
+            if error is not None:
+                # Satu kegagalan cukup: node yang bergantung ikut gagal
+                finish(dependent, error)
+                continue
+            with lock:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0 and not futures[dependent].done():
+                    ready.append(dependent)
+        for dependent in ready:
+            start(dependent)
+
+    def start(node):
+        try:
+            future = executor.submit(tasks[node])
+        except Exception as e:
+            # Executor sudah ditutup: node dan turunannya gagal, tidak menggantung
+            finish(node, e)
+            return
+        future.add_done_callback(
+            lambda f, node=node: finish(node, f.exception(), None if f.exception() else f.result())
+        )
+
+    for node, count in remaining.items():
+        if count == 0:
+            start(node)
+    return {name: futures[name] for name in dict.fromkeys(names)}
+
+
+def evaluate(sbox, names, executor=None):
+    """
+    Evaluate the metrics `names` through the scheduler.
+
+    Returns:
+        dict: metric name -> value; the first error is raised
+    """
+    futures = schedule(sbox, names, executor)
+    return {name: future.result() for name, future in futures.items()}
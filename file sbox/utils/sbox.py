@@ -0,0 +1,134 @@
+import hashlib
+import numpy as np
+from .helpers import validate_and_pad_sbox, popcount
+
+# Ukuran input yang didukung (dalam bit)
+MIN_BITS = 4
+MAX_BITS = 16
+
+
+class SBox:
+    """
+    Compact, immutable S-box value.
+
+    Holds the lookup table as a uint8 (uint16 for m > 8) array together
+    with its bit-sliced coordinate functions, so the metric modules can
+    share one conversion instead of re-deriving bits from the table in
+    every call.
+
+    Tables with 2^n entries for 4 <= n <= 16 are used as n x m S-boxes.
+    The output size m defaults to n (or the bit length of the largest
+    value if that is larger). Any other length is padded/truncated to 256
+    entries as before.
+
+    Attributes:
+        values (np.ndarray): lookup table, shape (2^n,)
+        n (int): input size in bits
+        m (int): output size in bits
+        bits (np.ndarray): coordinate truth tables, bits[j, x] = (S(x) >> j) & 1
+        coordinates (np.ndarray): `bits` packed into little-endian uint64 words
+    """
+
+    __slots__ = ("values", "n", "m", "bits", "coordinates", "_digest")
+
+    def __init__(self, values, m=None):
+        values = np.array(values, dtype=np.int64).ravel()
+        size = len(values)
+        if not (1 << MIN_BITS <= size <= 1 << MAX_BITS and size & (size - 1) == 0):
+            values = np.array(validate_and_pad_sbox(values.tolist()), dtype=np.int64)
+
+        n = int(len(values)).bit_length() - 1
+        if m is None:
+            m = max(n, int(values.max()).bit_length())
+        if not MIN_BITS <= m <= MAX_BITS:
+            raise ValueError(f"S-box output size must be {MIN_BITS}..{MAX_BITS} bits")
+        if values.min() < 0 or values.max() >= 1 << m:
+            raise ValueError(f"S-box values must be in the range 0..{(1 << m) - 1}")
+
+        values = values.astype(np.uint8 if m <= 8 else np.uint16)
+        values.flags.writeable = False
+
+        self.values = values
+        self.n = n
+        self.m = m
+
+        bits = ((values[None, :] >> np.arange(m)[:, None]) & 1).astype(np.uint8)
+        bits.flags.writeable = False
+        self.bits = bits
+        self.coordinates = pack_bits(bits)
+        self._digest = None
+
+    @classmethod
+    def coerce(cls, sbox):
+        """Return `sbox` unchanged if it already is an SBox, else build one."""
+        if isinstance(sbox, cls):
+            return sbox
+        return cls(sbox)
+
+    @property
+    def digest(self):
+        """Content hash of the S-box, stable across processes."""
+        if self._digest is None:
+            h = hashlib.sha256(f"{self.n}x{self.m}:".encode())
+            h.update(self.values.tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    @property
+    def size(self):
+        return len(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.values
+        return self.values.astype(dtype)
+
+    def __eq__(self, other):
+        if not isinstance(other, SBox):
+            return NotImplemented
+        return np.array_equal(self.values, other.values)
+
+    def __hash__(self):
+        return hash(self.values.tobytes())
+
+    def __repr__(self):
+        return f"SBox(n={self.n}, m={self.m})"
+
+    def tolist(self):
+        return self.values.tolist()
+
+    def is_bijective(self):
+        return self.n == self.m and len(np.unique(self.values)) == self.size
+
+    def component(self, mask):
+        """Packed truth table of the component function mask.S(x)."""
+        words = np.zeros(self.coordinates.shape[1], dtype=np.uint64)
+        for j in range(self.m):
+            if (mask >> j) & 1:
+                words ^= self.coordinates[j]
+        return words
+
+    def coordinate_weights(self):
+        """Hamming weight of every coordinate function."""
+        return popcount(self.coordinates).sum(axis=1, dtype=np.int64)
+
+
+def pack_bits(bits):
+    """
+    Pack a (rows, 2^n) 0/1 matrix into little-endian uint64 words per row.
+    Rows shorter than 64 bits are zero-padded to one word.
+    """
+    packed = np.packbits(bits, axis=-1, bitorder="little")
+    pad = (-packed.shape[-1]) % 8
+    if pad:
+        packed = np.pad(packed, [(0, 0)] * (packed.ndim - 1) + [(0, pad)])
+    return np.ascontiguousarray(packed).view("<u8")
@@ -0,0 +1,250 @@
+"""
+Screening S-box terhadap ambang batas dengan early exit.
+
+Spesifikasi ambang berupa dict metrik -> kondisi, misalnya
+
+    {"nl": (">=", 112), "du": ("<=", 4), "ad": ("==", 7), "sac": ("~", 0.5, 0.01)}
+
+atau string "nl>=112,du<=4,ad==7,sac=0.5~0.01" (lihat parse_thresholds).
+Pemeriksaan dijalankan dari yang termurah ke yang termahal dan berhenti
+pada kegagalan pertama. Metrik berbasis maksimum (DU, DAP, NL, LAP, AD,
+DLU, BU)
+dihitung per blok dan juga berhenti di tengah jalan begitu hasil akhirnya
+sudah pasti, misalnya begitu satu entri DDT melebihi batas DU.
+"""
+import re
+
+import numpy as np
+
+from .anf import mobius_transform, anf_degrees
+from .avalanche_criterion import strict_avalanche_criterion
+from .bit_independence import calculate_bic_sac
+from .boomerang import boomerang_rows
+from .correlation_immunity import compute_correlation_immunity
+from .difference_table import difference_rows
+from .sbox import SBox
+from .transparency_order import compute_transparency_order
+from .walsh import walsh_rows, autocorrelation_from_spectrum
+
+# Baris tabel per blok: cukup kecil agar kandidat yang gagal berhenti cepat
+DDT_BLOCK_ROWS = 8
+WALSH_BLOCK_ROWS = 16
+
+
+# METRIK BERTAHAP
+# Setiap generator menghasilkan nilai sementara metrik setelah setiap blok.
+# Nilai terakhir adalah nilai metrik yang sebenarnya.
+
+def _running_max(blocks):
+    current = None
+    for value in blocks:
+        current = value if current is None else max(current, value)
+        yield current
+
+
+def _ddt_maxima(sbox):
+    deltas = np.arange(1, sbox.size)
+    for start in range(0, len(deltas), DDT_BLOCK_ROWS):
+        yield int(difference_rows(sbox, deltas[start:start + DDT_BLOCK_ROWS]).max())
+
+
+def _walsh_maxima(sbox, masks, block_rows):
+    for start in range(0, len(masks), block_rows):
+        rows = walsh_rows(sbox, masks[start:start + block_rows])
+        yield int(np.max(np.abs(rows[:, 1:])))
+
+
+def _steps_du(sbox):
+    yield from _running_max(_ddt_maxima(sbox))
+
+
+def _steps_dap(sbox):
+    for count in _running_max(_ddt_maxima(sbox)):
+        yield count / sbox.size
+
+
+def _steps_nl(sbox):
+    # Satu fungsi koordinat per blok, seperti compute_nonlinearity
+    coordinates = np.array([1 << bit for bit in range(sbox.m)])
+    for bias in _running_max(_walsh_maxima(sbox, coordinates, 1)):
+        yield (1 << (sbox.n - 1)) - bias // 2
+
+
+def _steps_lap(sbox):
+    masks = np.arange(1, 1 << sbox.m)
+    for bias in _running_max(_walsh_maxima(sbox, masks, WALSH_BLOCK_ROWS)):
+        yield bias / sbox.size / 2
+
+
+def _steps_dlu(sbox):
+    def maxima():
+        masks = np.arange(1, 1 << sbox.m)
+        for start in range(0, len(masks), WALSH_BLOCK_ROWS):
+            rows = autocorrelation_from_spectrum(walsh_rows(sbox, masks[start:start + WALSH_BLOCK_ROWS]))
+            yield int(np.max(np.abs(rows[:, 1:]))) // 2
+
+    yield from _running_max(maxima())
+
+
+def _steps_bu(sbox):
+    def maxima():
+        deltas = np.arange(1, sbox.size)
+        for start in range(0, len(deltas), DDT_BLOCK_ROWS):
+            yield int(boomerang_rows(sbox, deltas[start:start + DDT_BLOCK_ROWS])[:, 1:].max())
+
+    yield from _running_max(maxima())
+
+
+def _steps_ad(sbox):
+    def degrees():
+        for bit in range(sbox.m):
+            anf = mobius_transform(sbox.bits[bit:bit + 1].copy())
+            yield int(anf_degrees(anf)[0])
+
+    yield from _running_max(degrees())
+
+
+def _full(func):
+    def steps(sbox):
+        yield func(sbox)
+    return steps
+
+
+# Nama -> (biaya relatif, generator nilai sementara, arah monoton)
+# Arah: +1 nilai sementara tidak pernah turun, -1 tidak pernah naik,
+# 0 hanya nilai akhir yang bermakna
+CHECKS = {
+    "bijective": (0, _full(lambda sbox: int(sbox.is_bijective())), 0),
+    "sac": (1, _full(strict_avalanche_criterion), 0),
+    "nl": (2, _steps_nl, -1),
+    "ad": (3, _steps_ad, +1),
+    "du": (4, _steps_du, +1),
+    "dap": (4, _steps_dap, +1),
+    "bic_sac": (5, _full(calculate_bic_sac), 0),
+    "lap": (6, _steps_lap, +1),
+    "dlu": (7, _steps_dlu, +1),
+    "ci": (7, _full(compute_correlation_immunity), 0),
+    "to": (8, _full(compute_transparency_order), 0),
+    "bu": (9, _steps_bu, +1),
+}
+
+
+# KONDISI
+
+def _satisfied(condition, value):
+    op, target = condition[0], condition[1]
+    if op == ">=":
+        return value >= target
+    if op == "<=":
+        return value <= target
+    if op == "==":
+        return value == target
+    if op == "~":
+        return abs(value - target) <= condition[2]
+    raise ValueError(f"Operator tidak dikenal: {op}")
+
+
+def _decided(condition, value, direction):
+    """
+    Whether the final result is already known from a running value.
+
+    Returns True/False once decided, None while more blocks are needed.
+    """
+    op, target = condition[0], condition[1]
+    if op == ">=":
+        low, high = target, None
+    elif op == "<=":
+        low, high = None, target
+    elif op == "==":
+        low, high = target, target
+    else:
+        low, high = target - condition[2], target + condition[2]
+
+    # Nilai akhir >= nilai sementara: gagal begitu melewati batas atas,
+    # lolos begitu mencapai batas bawah jika tidak ada batas atas
+    if direction > 0:
+        if high is not None and value > high:
+            return False
+        if high is None and value >= low:
+            return True
+    # Nilai akhir <= nilai sementara: kebalikannya
+    elif direction < 0:
+        if low is not None and value < low:
+            return False
+        if low is None and value <= high:
+            return True
+    return None
+
+
+def check_threshold(sbox, name, condition):
+    """
+    Check one metric against a condition, stopping as early as possible.
+
+    Returns:
+        tuple: (passed, value) where value is the metric value, or the
+               running bound at the moment the check was decided
+    """
+    sbox = SBox.coerce(sbox)
+    _, steps, direction = CHECKS[name]
+    value = None
+    for value in steps(sbox):
+        decided = _decided(condition, value, direction)
+        if decided is not None:
+            return decided, value
+    return _satisfied(condition, value), value
+
+
+def order_checks(spec):
+    """Metric names of a threshold spec, cheapest check first."""
+    unknown = [name for name in spec if name not in CHECKS]
+    if unknown:
+        raise ValueError(f"Metrik screening tidak dikenal: {', '.join(unknown)}")
+    return sorted(spec, key=lambda name: CHECKS[name][0])
+
+
+def screen_sbox(sbox, spec):
+    """
+    Screen an S-box against a threshold spec, cheapest check first,
+    stopping at the first failing check.
+
+    Returns:
+        dict: passed (bool), failed (name of the failing metric or None),
+              values {metric: value or running bound} of the checks run
+    """
+    sbox = SBox.coerce(sbox)
+    values = {}
+    for name in order_checks(spec):
+        passed, values[name] = check_threshold(sbox, name, spec[name])
+        if not passed:
+            return {"passed": False, "failed": name, "values": values}
+    return {"passed": True, "failed": None, "values": values}
+
+
+_CONDITION = re.compile(r"^\s*(\w+)\s*(>=|<=|==|=)\s*([-+0-9.eE]+)\s*(?:~\s*([-+0-9.eE]+))?\s*$")
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+def parse_thresholds(text):
+    """
+    Parse "nl>=112,du<=4,ad==7,sac=0.5~0.01" into a threshold spec.
+    "name=target~tolerance" means |value - target| <= tolerance,
+    "bijective==1" requires a permutation.
+    """
+    spec = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        match = _CONDITION.match(part)
+        if not match:
+            raise ValueError(f"Kondisi screening tidak valid: {part}")
+        name, op, target, tolerance = match.groups()
+        if tolerance is not None:
+            spec[name] = ("~", _number(target), _number(tolerance))
+        elif op == "=":
+            spec[name] = ("==", _number(target))
+        else:
+            spec[name] = (op, _number(target))
+    order_checks(spec)
+    return spec
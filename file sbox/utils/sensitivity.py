@@ -0,0 +1,225 @@
+"""
+Eksperimen sensitivitas kunci dan plaintext untuk enkripsi image.
+
+Key sensitivity: setiap bit dari 128 bit kunci dibalik satu per satu.
+Plaintext sensitivity: satu piksel plaintext diubah (satu bit dibalik).
+Untuk setiap percobaan, NPCR dan UACI dihitung terhadap cipher-image
+dengan kunci/plaintext asli.
+
+Plain image dan cipher-image acuan ditaruh sekali di shared memory, lalu
+percobaan dibagi ke process pool. Setiap worker mengenkripsi dan
+membandingkan per chunk, sehingga tidak ada cipher-image utuh yang
+disimpan. Yang dikembalikan hanya nilai per percobaan dan ringkasannya.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from multiprocessing.util import Finalize
+
+import numpy as np
+
+from .aes_core import AESEngine, BLOCK_SIZE
+from .aes_stream import DEFAULT_CHUNK_SIZE, ctr_keystream
+from .image_metrics import difference_counts
+from .sbox import SBox
+
+KEY_BITS = 128
+
+# Nilai ideal NPCR/UACI (%) untuk dua image 8-bit acak yang independen
+EXPECTED_NPCR = (1 - 1 / 256) * 100
+EXPECTED_UACI = sum(i * (256 - i) for i in range(1, 256)) * 2 / (256 * 256 * 255) * 100
+
+
+def flip_key_bit(key, bit):
+    """Key with bit `bit` flipped, bit 0 being the most significant bit of key[0]."""
+    flipped = bytearray(key)
+    flipped[bit // 8] ^= 0x80 >> (bit % 8)
+    return bytes(flipped)
+
+
+def encrypt_chunks(plain, key, sbox_values, mode="ECB", nonce=None, flip=None,
+                   chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Encrypt the flat uint8 array `plain` chunk by chunk, yielding
+    (offset, cipher chunk). ECB zero-pads the last block and truncates it
+    again like aes_image.encrypt_image, CTR uses ctr_keystream with the
+    8-byte `nonce`. `flip` = (byte index, bit mask) alters one plaintext
+    byte on the fly without copying the whole image.
+    """
+    engine = AESEngine(key, sbox_values)
+    for start in range(0, len(plain), chunk_size):
+        chunk = plain[start:start + chunk_size]
+        if flip is not None and start <= flip[0] < start + len(chunk):
+            chunk = chunk.copy()
+            chunk[flip[0] - start] ^= flip[1]
+
+        nblocks = -(-len(chunk) // BLOCK_SIZE)
+        if mode == "CTR":
+            keystream = ctr_keystream(engine, nonce, start // BLOCK_SIZE, nblocks).reshape(-1)
+            yield start, chunk ^ keystream[:len(chunk)]
+        else:
+            padded = np.zeros(nblocks * BLOCK_SIZE, dtype=np.uint8)
+            padded[:len(chunk)] = chunk
+            yield start, engine.encrypt_blocks(padded.reshape(-1, BLOCK_SIZE)).reshape(-1)[:len(chunk)]
+
+
+# WORKER
+
+_worker = {}
+
+
+def _attach(name, size):
+    # Worker memakai resource tracker yang sama dengan proses utama, jadi
+    # segmen hanya dihapus sekali oleh proses utama (unlink)
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray((size,), dtype=np.uint8, buffer=shm.buf)
+
+
+def _detach():
+    # Lepas view numpy dulu, baru handle shared memory bisa ditutup
+    shms = _worker.pop("shms", ())
+    _worker.clear()
+    for shm in shms:
+        shm.close()
+
+
+def _init_worker(plain_name, cipher_name, size, key, sbox_values, mode, nonce, chunk_size):
+    plain_shm, plain = _attach(plain_name, size)
+    cipher_shm, cipher = _attach(cipher_name, size)
+    _worker.update(
+        shms=(plain_shm, cipher_shm), plain=plain, cipher=cipher, key=key,
+        sbox=sbox_values, mode=mode, nonce=nonce, chunk_size=chunk_size,
+    )
+    # Worker process pool keluar tanpa atexit; finalizer multiprocessing tetap jalan
+    Finalize(None, _detach, exitpriority=10)
+
+
+def _run_trial(key=None, flip=None):
+    """NPCR and UACI of one trial against the reference cipher-image."""
+    changed = abs_diff = 0
+    chunks = encrypt_chunks(_worker["plain"], key or _worker["key"], _worker["sbox"],
+                            _worker["mode"], _worker["nonce"], flip, _worker["chunk_size"])
+    for start, chunk in chunks:
+        reference = _worker["cipher"][start:start + len(chunk)]
+        chunk_changed, chunk_diff = difference_counts(chunk, reference)
+        changed += chunk_changed
+        abs_diff += chunk_diff
+    size = len(_worker["plain"])
+    return changed / size * 100, abs_diff / (255 * size) * 100
+
+
+def _key_trial(bit):
+    return _run_trial(key=flip_key_bit(_worker["key"], bit))
+
+
+def _pixel_trial(flip):
+    return _run_trial(flip=flip)
+
+
+# RUNNER
+
+def _summary(values):
+    values = np.asarray(values, dtype=float)
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+
+
+def _run_experiment(img_array, key, sbox, trial, params, mode, nonce, workers, chunk_size):
+    if len(key) != 16:
+        raise ValueError("Key harus 16 byte (AES-128).")
+    if mode not in ("ECB", "CTR"):
+        raise ValueError(f"Mode tidak didukung: {mode}")
+    if mode == "CTR" and (nonce is None or len(nonce) != 8):
+        raise ValueError("Mode CTR membutuhkan nonce 8 byte.")
+    if chunk_size % BLOCK_SIZE:
+        raise ValueError("chunk_size harus kelipatan 16 byte.")
+
+    image = np.asarray(img_array)
+    if image.dtype != np.uint8:
+        raise ValueError("Image harus bertipe uint8.")
+    size = image.size
+    # Validasi S-box (nilai di luar 0..255 tidak boleh terpotong diam-diam)
+    sbox = SBox.coerce(sbox)
+    if sbox.n != 8 or sbox.m != 8:
+        raise ValueError("AES membutuhkan S-box 8x8.")
+    sbox_values = sbox.values
+
+    plain_shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    cipher_shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        plain = np.ndarray((size,), dtype=np.uint8, buffer=plain_shm.buf)
+        plain[:] = image.reshape(-1)
+        cipher = np.ndarray((size,), dtype=np.uint8, buffer=cipher_shm.buf)
+        for start, chunk in encrypt_chunks(plain, key, sbox_values, mode, nonce,
+                                           chunk_size=chunk_size):
+            cipher[start:start + len(chunk)] = chunk
+
+        workers = workers or os.cpu_count() or 1
+        initargs = (plain_shm.name, cipher_shm.name, size, bytes(key), sbox_values,
+                    mode, nonce, chunk_size)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+            results = list(pool.map(trial, params))
+        del plain, cipher
+    finally:
+        for shm in (plain_shm, cipher_shm):
+            shm.close()
+            shm.unlink()
+
+    npcr = [r[0] for r in results]
+    uaci = [r[1] for r in results]
+    return {
+        "trials": len(results),
+        "npcr": _summary(npcr),
+        "uaci": _summary(uaci),
+        "npcr_values": npcr,
+        "uaci_values": uaci,
+        "expected": {"npcr": EXPECTED_NPCR, "uaci": EXPECTED_UACI},
+    }
+
+
+def key_sensitivity(img_array, key, sbox, bits=None, mode="ECB", nonce=None,
+                    workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Flip every key bit (or the given `bits`) and compare each cipher-image
+    with the one under the original key.
+
+    Returns:
+        dict: trials, npcr / uaci summaries (mean, std, min, max in %),
+              the per-trial npcr_values / uaci_values in bit order and the
+              expected values for random images
+    """
+    bits = list(range(KEY_BITS)) if bits is None else list(bits)
+    result = _run_experiment(img_array, key, sbox, _key_trial, bits, mode, nonce,
+                             workers, chunk_size)
+    result["bits"] = bits
+    return result
+
+
+def plaintext_sensitivity(img_array, key, sbox, pixels=None, count=32, seed=None, bit=0,
+                          mode="ECB", nonce=None, workers=None,
+                          chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Flip bit `bit` of the first channel of single pixels and compare each
+    cipher-image with the one of the original plaintext. `pixels` is a
+    list of (row, col) positions, by default `count` random ones from `seed`.
+
+    Returns:
+        dict: like key_sensitivity, with the flipped `pixels` instead of bits
+    """
+    image = np.asarray(img_array)
+    height, width = image.shape[:2]
+    channels = image.size // (height * width)
+    if pixels is None:
+        rng = np.random.default_rng(seed)
+        flat = rng.choice(height * width, size=min(count, height * width), replace=False)
+        pixels = [(int(p // width), int(p % width)) for p in flat]
+
+    flips = [((row * width + col) * channels, 1 << bit) for row, col in pixels]
+    result = _run_experiment(image, key, sbox, _pixel_trial, flips, mode, nonce,
+                             workers, chunk_size)
+    result["pixels"] = [tuple(p) for p in pixels]
+    return result
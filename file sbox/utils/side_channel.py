@@ -0,0 +1,166 @@
+"""
+Metrik ketahanan side-channel S-box, semuanya diturunkan dari tabel yang
+sama (spektrum Walsh koordinat dan tabel Hamming weight):
+
+- Transparency order (Prouff) dan modified transparency order
+  (Chakraborty dkk. 2017) dari cross-correlation antar fungsi koordinat,
+  C_ij(a) = sum_x (-1)^(S_i(x) xor S_j(x xor a)) = WHT(W_i * W_j)(a) / 2^n
+- Confusion coefficient model Hamming weight untuk setiap pasangan kunci
+- SNR kebocoran Hamming weight untuk setiap tebakan kunci
+"""
+import numpy as np
+
+from .analysis import get_analysis
+from .helpers import popcount, iter_row_chunks
+from .transparency_order import compute_transparency_order
+from .walsh import fwht
+
+
+def coordinate_cross_correlation(sbox):
+    """
+    Cross-correlation of every pair of coordinate functions.
+
+    Returns:
+        np.ndarray: C with C[i, j, a] = sum_x (-1)^(S_i(x) xor S_j(x xor a)),
+                    computed as the Walsh transform of W_i * W_j
+    """
+    analysis = get_analysis(sbox)
+    m = analysis.sbox.m
+    coordinates = [1 << bit for bit in range(m)]
+    walsh = np.concatenate([rows for _, rows in analysis.walsh_rows(coordinates)]).astype(np.int64)
+
+    products = walsh[:, None, :] * walsh[None, :, :]
+    return fwht(products) // analysis.sbox.size
+
+
+def _beta_signs(betas, m):
+    # (-1)^(beta_i) untuk setiap beta (baris) dan bit i (kolom)
+    return 1 - 2 * ((betas[:, None] >> np.arange(m)) & 1)
+
+
+def transparency_orders(sbox, cross_correlation=None):
+    """
+    Transparency order (Prouff 2005) and modified transparency order
+    (Chakraborty et al. 2017) from the coordinate cross-correlation.
+
+    TO  = max_b ( |m - 2 wt(b)| - 1/(2^2n - 2^n) sum_{a != 0} |sum_i (-1)^(b_i) C_ii(a)| )
+    MTO = max_b ( m - 1/(2^2n - 2^n) sum_{a != 0} sum_j |sum_i (-1)^(b_i xor b_j) C_ij(a)| )
+
+    TO only needs the autocorrelation C_ii and comes from
+    compute_transparency_order.
+
+    Returns:
+        dict: transparency_order, modified_transparency_order
+    """
+    analysis = get_analysis(sbox)
+    N = analysis.sbox.size
+    m = analysis.sbox.m
+    if cross_correlation is None:
+        cross_correlation = coordinate_cross_correlation(sbox)
+    nontrivial = cross_correlation[:, :, 1:].reshape(m, -1)
+    scale = N * N - N
+
+    # |(-1)^(b_j) sum_i (-1)^(b_i) C_ij(a)| = |sum_i (-1)^(b_i) C_ij(a)|,
+    # diproses per blok beta agar memori tetap terbatas untuk m besar
+    mto_max = -np.inf
+    for betas in iter_row_chunks(np.arange(1 << m), nontrivial.shape[1]):
+        mixed = _beta_signs(betas, m) @ nontrivial
+        mto_max = max(mto_max, float((m - np.abs(mixed).sum(axis=1) / scale).max()))
+
+    return {
+        "transparency_order": compute_transparency_order(sbox),
+        "modified_transparency_order": mto_max,
+    }
+
+
+def compute_modified_transparency_order(sbox):
+    """Modified transparency order (MTO) of the S-box."""
+    return transparency_orders(sbox)["modified_transparency_order"]
+
+
+def confusion_coefficient_table(sbox):
+    """
+    Hamming-weight confusion coefficient for every key difference d,
+    kappa(d) = E_x[(HW(S(x)) - HW(S(x xor d)))^2].
+
+    kappa(k_i, k_j) only depends on d = k_i xor k_j and equals
+    2 (E[HW^2] - R(d) / 2^n), with R the autocorrelation of the HW table.
+    """
+    analysis = get_analysis(sbox)
+    N = analysis.sbox.size
+    weights = popcount(analysis.sbox.values).astype(np.int64)
+
+    # R(d) = sum_x HW(x) HW(x xor d) = WHT(WHT(HW)^2) / 2^n
+    spectrum = fwht(weights.copy())
+    autocorrelation = fwht(spectrum * spectrum) // N
+    return 2 * (np.dot(weights, weights) - autocorrelation) / N
+
+
+def confusion_coefficients(sbox):
+    """kappa(d) for every d, cached per S-box by utils.analysis (table "confusion")."""
+    return get_analysis(sbox).table("confusion")
+
+
+def confusion_coefficient_stats(sbox):
+    """
+    Mean and variance of the confusion coefficient over all pairs of
+    distinct keys (every d != 0 occurs equally often).
+
+    Returns:
+        dict: mean, variance, min, max
+    """
+    kappa = confusion_coefficients(sbox)[1:]
+    return {
+        "mean": float(kappa.mean()),
+        "variance": float(kappa.var()),
+        "min": float(kappa.min()),
+        "max": float(kappa.max()),
+    }
+
+
+def hamming_weight_snr(sbox, noise_variance=1.0):
+    """
+    SNR of the Hamming-weight leakage for every key guess.
+
+    The device leaks HW(S(x xor k*)) plus Gaussian noise. A key guess
+    k = k* xor d partitions the inputs by its prediction HW(S(x xor k)),
+    and SNR[d] = Var(E[leakage | prediction]) / (E[Var(leakage | prediction)]
+    + noise_variance). SNR[0] is the correct key.
+    """
+    analysis = get_analysis(sbox)
+    N = analysis.sbox.size
+    m = analysis.sbox.m
+    weights = popcount(analysis.sbox.values).astype(np.int64)
+
+    # x -> x xor d permutasi, jadi ukuran kelas prediksi h sama untuk setiap d;
+    # jumlah leakage per kelas adalah korelasi HW dengan indikator kelas:
+    # sums[d, h] = sum_x HW(x) [HW(x xor d) = h] = WHT(WHT(HW) WHT(1_h))(d) / 2^n
+    counts = np.bincount(weights, minlength=m + 1)
+    indicators = (weights[None, :] == np.arange(m + 1)[:, None]).astype(np.int64)
+    spectrum = fwht(weights.copy())
+    sums = (fwht(fwht(indicators) * spectrum) // N).T
+    means = np.divide(sums, counts, out=np.zeros(sums.shape), where=counts > 0)
+
+    mean = weights.mean()
+    variance = weights.var()
+    signal = (counts * (means - mean) ** 2).sum(axis=1) / N
+    # Var total = signal + noise dalam kelas
+    noise = variance - signal + noise_variance
+    return signal / noise
+
+
+def side_channel_profile(sbox, noise_variance=1.0):
+    """
+    All side-channel metrics from one set of tables.
+
+    Returns:
+        dict: transparency_order, modified_transparency_order,
+              confusion_coefficient (mean/variance/min/max),
+              snr_correct_key, snr_max_wrong_key
+    """
+    profile = transparency_orders(sbox)
+    profile["confusion_coefficient"] = confusion_coefficient_stats(sbox)
+    snr = hamming_weight_snr(sbox, noise_variance)
+    profile["snr_correct_key"] = float(snr[0])
+    profile["snr_max_wrong_key"] = float(snr[1:].max())
+    return profile
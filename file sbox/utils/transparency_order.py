@@ -1,23 +1,32 @@
 import numpy as np
+from .helpers import popcount, iter_row_chunks
+from .analysis import get_analysis
 
 def compute_transparency_order(sbox):
     """
-    Menghitung Transparency Order (TO) S-Box 8x8
+    Menghitung Transparency Order (TO) S-Box n x m
     berdasarkan definisi Prouff (2005)
+
+    TO = max_beta ( |m - 2 wt(beta)|
+         - 1 / (2^2n - 2^n) * sum_{a != 0} | sum_{wt(v) = 1} (-1)^(v.beta) AC_v(a) | )
     """
-    sbox = np.array(sbox)
-    n = 8
-    N = 256
+    analysis = get_analysis(sbox)
+    N = analysis.sbox.size
+    m = analysis.sbox.m
 
-    to_sum = 0
+    # Autocorrelation fungsi koordinat (mask output v dengan wt(v) = 1), a != 0
+    coordinates = np.array([1 << bit for bit in range(m)])
+    coordinate_ac = np.concatenate(
+        [rows for _, rows in analysis.autocorrelation_rows(coordinates)]
+    )[:, 1:]
 
-    for a in range(1, N):
-        for b in range(N):
-            parity = 0
-            for x in range(N):
-                y1 = sbox[x]
-                y2 = sbox[x ^ a]
-                parity += bin(y1 & b).count("1") ^ bin(y2 & b).count("1")
-            to_sum += abs(parity)
+    # (-1)^(v.beta) untuk setiap beta dan setiap fungsi koordinat v,
+    # diproses per blok beta agar memori tetap terbatas untuk m besar
+    to_max = -np.inf
+    for betas in iter_row_chunks(np.arange(1 << m), N):
+        signs = 1 - 2 * ((betas[:, None] & coordinates[None, :]) != 0)
+        to_sum = np.abs(signs @ coordinate_ac).sum(axis=1)
+        to_values = np.abs(m - 2 * popcount(betas).astype(int)) - to_sum / (N * N - N)
+        to_max = max(to_max, float(to_values.max()))
 
-    return to_sum / ((N - 1) * N * (2 ** n))
+    return to_max
@@ -0,0 +1,114 @@
+import numpy as np
+from .difference_table import difference_rows
+from .helpers import iter_row_chunks, parity
+from .sbox import SBox
+
+
+def fwht(a):
+    """
+    In-place Fast Walsh-Hadamard Transform over the last axis of a
+    C-contiguous integer array. All rows are transformed in the same pass.
+    """
+    size = a.shape[-1]
+    rows = a.reshape(-1, size)
+    h = 1
+    while h < size:
+        view = rows.reshape(rows.shape[0], -1, 2, h)
+        x = view[:, :, 0, :]
+        y = view[:, :, 1, :]
+        tmp = x.copy()
+        x += y
+        np.subtract(tmp, y, out=y)
+        h *= 2
+    return a
+
+
+def walsh_rows(sbox, masks):
+    """
+    Rows W[masks] of the Walsh spectrum, W[b, a] = sum_x (-1)^(b.S(x) xor a.x).
+    """
+    sbox = SBox.coerce(sbox)
+    masks = np.asarray(masks)
+    mask_bits = ((masks[:, None] >> np.arange(sbox.m)) & 1).astype(np.int32)
+
+    # Truth tables of the component functions b.S(x) from the bit-sliced
+    # coordinates, turned into polarity form (+1 / -1)
+    components = (mask_bits @ sbox.bits.astype(np.int32)) & 1
+    spectrum = 1 - 2 * components
+    return fwht(spectrum)
+
+
+def walsh_spectrum(sbox):
+    """
+    Walsh spectrum of every component function of the S-box.
+
+    Returns an array W with W[b, a] = sum_x (-1)^(b.S(x) xor a.x),
+    i.e. row b is the Walsh spectrum of the component function b.S(x).
+    """
+    sbox = SBox.coerce(sbox)
+    return walsh_rows(sbox, np.arange(1 << sbox.m))
+
+
+def iter_walsh_spectrum(sbox, masks=None, chunk_rows=None):
+    """
+    Yield (masks, W[masks]) blocks of the Walsh spectrum with bounded
+    memory, for S-boxes whose full 2^m x 2^n table does not fit.
+    """
+    sbox = SBox.coerce(sbox)
+    if masks is None:
+        masks = np.arange(1 << sbox.m)
+    for chunk in iter_row_chunks(np.asarray(masks), sbox.size, chunk_rows):
+        yield chunk, walsh_rows(sbox, chunk)
+
+
+def linear_approximation_table(sbox):
+    """
+    Linear Approximation Table (LAT) of the S-box.
+
+    LAT[a, b] = #{x : a.x = b.S(x)} - 2^(n-1) for input mask a and output mask b.
+    """
+    return walsh_spectrum(sbox).T // 2
+
+
+def autocorrelation_table(sbox):
+    """
+    Autocorrelation spectrum of every component function of the S-box.
+
+    Returns an array AC with AC[b, a] = sum_x (-1)^(b.(S(x) xor S(x xor a))),
+    obtained from the Walsh spectrum via AC_b = WHT(W_b^2) / 2^n.
+    """
+    return autocorrelation_from_spectrum(walsh_spectrum(sbox))
+
+
+def linear_approximation_rows(sbox, masks):
+    """
+    Rows LAT[masks] of the LAT for input masks a, without the full spectrum.
+
+    W[b, a] = sum_y (-1)^(b.y) g_a(y) with g_a(y) = sum_{x : S(x) = y} (-1)^(a.x),
+    so a row is one bincount of the input signs followed by a WHT over y.
+    """
+    sbox = SBox.coerce(sbox)
+    masks = np.asarray(masks)
+    columns = 1 << sbox.m
+    x = np.arange(sbox.size)
+    signs = 1 - 2 * parity(masks[:, None] & x[None, :]).astype(np.int64)
+    offsets = np.arange(len(masks))[:, None] * columns
+    g = np.bincount((sbox.values.astype(np.int64)[None, :] + offsets).ravel(),
+                    weights=signs.ravel(), minlength=len(masks) * columns)
+    return fwht(g.astype(np.int64).reshape(len(masks), columns)) // 2
+
+
+def differential_linear_rows(sbox, deltas):
+    """
+    Rows DLCT[deltas] of the DLCT, the Walsh transform of the DDT rows:
+    AC[l, a] = sum_b (-1)^(l.b) DDT[a, b].
+    """
+    return fwht(difference_rows(sbox, deltas).astype(np.int64)) // 2
+
+
+def autocorrelation_from_spectrum(spectrum):
+    """Autocorrelation table from an already computed Walsh spectrum."""
+    spectrum = np.asarray(spectrum, dtype=np.int64)
+    size = spectrum.shape[-1]
+    squared = spectrum * spectrum
+    return fwht(squared) // size